@@ -0,0 +1,153 @@
+"""
+Vue triée d'un OrderDepth, partagée par les étapes d'une stratégie, qui mémorise ses valeurs dérivées.
+"""
+
+
+class BookView:
+    def __init__(self, order_depth):
+        self.order_depth = order_depth
+        self._cache = {}
+
+    @property
+    def bids(self):
+        """
+        Niveaux acheteurs [(prix, volume)], du plus cher au moins cher.
+        """
+        if "bids" not in self._cache:
+            self._cache["bids"] = sorted(self.order_depth.buy_orders.items(), reverse=True)
+        return self._cache["bids"]
+
+    @property
+    def asks(self):
+        """
+        Niveaux vendeurs [(prix, volume positif)], du moins cher au plus cher.
+        """
+        if "asks" not in self._cache:
+            self._cache["asks"] = [(price, -volume) for price, volume in sorted(self.order_depth.sell_orders.items())]
+        return self._cache["asks"]
+
+    @property
+    def best_bid(self):
+        return self.bids[0][0] if self.bids else None
+
+    @property
+    def best_ask(self):
+        return self.asks[0][0] if self.asks else None
+
+    @property
+    def best_bid_volume(self):
+        return self.bids[0][1] if self.bids else 0
+
+    @property
+    def best_ask_volume(self):
+        return self.asks[0][1] if self.asks else 0
+
+    @property
+    def mid_price(self):
+        """
+        (meilleur bid + meilleur ask) / 2, ou None si un côté du carnet est vide.
+        """
+        if not self.bids or not self.asks:
+            return None
+        return (self.best_bid + self.best_ask) / 2.0
+
+    @property
+    def cumulative_bid_volume(self):
+        """
+        Volume cumulé des bids, niveau par niveau à partir du meilleur.
+        """
+        if "cumulative_bids" not in self._cache:
+            self._cache["cumulative_bids"] = _cumulate(self.bids)
+        return self._cache["cumulative_bids"]
+
+    @property
+    def cumulative_ask_volume(self):
+        """
+        Volume cumulé des asks, niveau par niveau à partir du meilleur.
+        """
+        if "cumulative_asks" not in self._cache:
+            self._cache["cumulative_asks"] = _cumulate(self.asks)
+        return self._cache["cumulative_asks"]
+
+    @property
+    def total_bid_volume(self):
+        return self.cumulative_bid_volume[-1] if self.bids else 0
+
+    @property
+    def total_ask_volume(self):
+        return self.cumulative_ask_volume[-1] if self.asks else 0
+
+    @property
+    def imbalance(self):
+        """
+        (volume acheteur - volume vendeur) / volume total, 0.0 si le carnet est vide.
+        """
+        total = self.total_bid_volume + self.total_ask_volume
+        if total <= 0:
+            return 0.0
+        return (self.total_bid_volume - self.total_ask_volume) / total
+
+    def bid_volume_at_or_above(self, price):
+        """
+        Volume total des bids à un prix supérieur ou égal à `price`.
+        """
+        for i, (level_price, _) in enumerate(self.bids):
+            if level_price < price:
+                return self.cumulative_bid_volume[i - 1] if i else 0
+        return self.total_bid_volume
+
+    def ask_volume_at_or_below(self, price):
+        """
+        Volume total des asks à un prix inférieur ou égal à `price`.
+        """
+        for i, (level_price, _) in enumerate(self.asks):
+            if level_price > price:
+                return self.cumulative_ask_volume[i - 1] if i else 0
+        return self.total_ask_volume
+
+    def best_bid_below(self, price):
+        """
+        Meilleur bid strictement inférieur à `price`, ou None.
+        """
+        for level_price, _ in self.bids:
+            if level_price < price:
+                return level_price
+        return None
+
+    def best_ask_above(self, price):
+        """
+        Meilleur ask strictement supérieur à `price`, ou None.
+        """
+        for level_price, _ in self.asks:
+            if level_price > price:
+                return level_price
+        return None
+
+    def consume_ask(self, price, quantity: int):
+        """
+        Retire `quantity` (achetée par la stratégie) du niveau vendeur `price`.
+        """
+        sell_orders = self.order_depth.sell_orders
+        sell_orders[price] += quantity
+        if sell_orders[price] == 0:
+            del sell_orders[price]
+        self._cache.clear()
+
+    def consume_bid(self, price, quantity: int):
+        """
+        Retire `quantity` (vendue par la stratégie) du niveau acheteur `price`.
+        """
+        buy_orders = self.order_depth.buy_orders
+        buy_orders[price] -= quantity
+        if buy_orders[price] == 0:
+            del buy_orders[price]
+        self._cache.clear()
+
+
+def _cumulate(levels):
+    cumulative = []
+    total = 0
+    for _, volume in levels:
+        total += volume
+        cumulative.append(total)
+    return cumulative
@@ -0,0 +1,121 @@
+"""
+RSI et pente de régression glissante, mis à jour en temps constant à chaque tick.
+"""
+from ring_buffer import load_ring_buffer
+
+RSI_SIMPLE = "simple"
+RSI_WILDER = "wilder"
+
+
+def new_rsi(period: int, mode: str = RSI_SIMPLE):
+    """
+    Crée l'état d'un RSI de période `period` : dernier prix, nombre de variations reçues et
+    hausses / baisses (sommes sur la fenêtre en mode simple, moyennes lissées en mode Wilder).
+    """
+    return {"period": period, "mode": mode, "last": None, "count": 0, "gain": 0.0, "loss": 0.0, "changes": None}
+
+
+def rsi_update(rsi, price):
+    """
+    Ajoute le prix du tick courant.
+    """
+    last = rsi["last"]
+    rsi["last"] = price
+    if last is None:
+        return
+    period = rsi["period"]
+    change = price - last
+    rsi["count"] += 1
+
+    if rsi["mode"] == RSI_WILDER:
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        if rsi["count"] < period:
+            # Initialisation : sommes des premières variations
+            rsi["gain"] += gain
+            rsi["loss"] += loss
+        elif rsi["count"] == period:
+            rsi["gain"] = (rsi["gain"] + gain) / period
+            rsi["loss"] = (rsi["loss"] + loss) / period
+        else:
+            rsi["gain"] = (rsi["gain"] * (period - 1) + gain) / period
+            rsi["loss"] = (rsi["loss"] * (period - 1) + loss) / period
+        return
+
+    changes = load_ring_buffer(rsi["changes"], period)
+    rsi["changes"] = changes
+    evicted = changes.append(change)
+    # Variation telle que stockée, pour que la sortie de fenêtre retire exactement ce qui a été ajouté
+    change = changes[-1]
+    if change > 0:
+        rsi["gain"] += change
+    else:
+        rsi["loss"] -= change
+    if evicted is not None:
+        if evicted > 0:
+            rsi["gain"] -= evicted
+        else:
+            rsi["loss"] += evicted
+
+
+def rsi_value(rsi):
+    """
+    Valeur du RSI (entre 0 et 100), ou None tant que `period` variations n'ont pas été reçues.
+    Comme dans KelpStrategy, le RSI vaut 100 lorsqu'il n'y a aucune baisse.
+    """
+    period = rsi["period"]
+    if rsi["count"] < period:
+        return None
+    if rsi["mode"] == RSI_WILDER:
+        avg_gain, avg_loss = rsi["gain"], rsi["loss"]
+    else:
+        avg_gain, avg_loss = rsi["gain"] / period, rsi["loss"] / period
+    if avg_loss == 0:
+        return 100
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def new_slope(window: int):
+    """
+    Crée l'état d'une pente glissante sur `window` prix : nombre de prix dans la fenêtre,
+    décalage, Σy et Σxy des écarts au décalage, et valeurs de la fenêtre (RingBuffer).
+    """
+    return {"window": window, "count": 0, "shift": None, "sum": 0.0, "sumxy": 0.0, "values": None}
+
+
+def slope_update(slope, price):
+    """
+    Ajoute le prix du tick courant.
+    """
+    window = slope["window"]
+    values = load_ring_buffer(slope["values"], window)
+    slope["values"] = values
+    evicted = values.append(price)
+    # Valeur telle que stockée, pour que la sortie de fenêtre retire exactement ce qui a été ajouté
+    price = values[-1]
+    if slope["shift"] is None:
+        slope["shift"] = price
+    delta = price - slope["shift"]
+    if evicted is None:
+        slope["sumxy"] += slope["count"] * delta
+        slope["sum"] += delta
+        slope["count"] += 1
+        return
+    # La fenêtre avance : chaque valeur restante perd 1 d'indice, la nouvelle entre à l'indice window - 1
+    remaining = slope["sum"] - (evicted - slope["shift"])
+    slope["sumxy"] += (window - 1) * delta - remaining
+    slope["sum"] = remaining + delta
+
+
+def slope_value(slope):
+    """
+    Pente de la régression sur la fenêtre, ou None tant que `window` prix n'ont pas été reçus.
+    """
+    window = slope["window"]
+    if slope["count"] < window:
+        return None
+    den = window * (window * window - 1) / 12
+    if den == 0:
+        return 0
+    return (slope["sumxy"] - (window - 1) / 2 * slope["sum"]) / den
@@ -0,0 +1,110 @@
+"""
+Historique de taille fixe (tampon circulaire), stocké en écarts empaquetés dans le traderData.
+"""
+from array import array
+
+# Nombre de décimales conservées (les mid prices sont au demi-point)
+PRECISION = 2
+
+
+class RingBuffer:
+    """
+    Historique de capacité `capacity`, relu depuis `data` : sa forme sérialisée (voir to_data) ou
+    une liste de valeurs (ancien traderData). Les ajouts ne modifient que le tableau en mémoire ;
+    state_codec le sérialise une seule fois, à l'encodage du traderData en fin de Trader.run.
+    S'indexe comme une liste, de la plus ancienne valeur (0) à la plus récente (-1), tranches comprises.
+    """
+
+    def __init__(self, data=None, capacity: int = 30, precision: int = PRECISION):
+        self.capacity = capacity
+        if isinstance(data, dict):
+            self.scale = data.get("s", 10 ** precision)
+            self.head = data["h"]
+            try:
+                self.values = array("i", data["v"])
+            except OverflowError:
+                self.values = array("q", data["v"])
+        else:
+            self.scale = 10 ** precision
+            self.head = 0
+            self.values = array("i")
+            for value in data or []:
+                self._store(len(self.values), value)
+        if len(self.values) > capacity or (self.head and len(self.values) < capacity):
+            # Capacité modifiée : remise dans l'ordre, en ne gardant que les valeurs les plus récentes
+            ordered = self.values[self.head:] + self.values[:self.head]
+            self.values = ordered[-capacity:]
+            self.head = 0
+
+    def _store(self, position: int, value):
+        scaled = round(value * self.scale)
+        try:
+            if position == len(self.values):
+                self.values.append(scaled)
+            else:
+                self.values[position] = scaled
+        except OverflowError:
+            # Valeur trop grande pour des entiers 32 bits : passage en 64 bits
+            self.values = array("q", self.values)
+            self._store(position, value)
+
+    def to_data(self):
+        """
+        Forme sérialisée {"h": tête, "v": valeurs mises à l'échelle} (plus "s", l'échelle, si elle
+        n'est pas celle de PRECISION), appelée par state_codec, qui empaquette la liste d'entiers
+        "v" en écarts successifs dans le plus petit type entier qui convient.
+        """
+        data = {"h": self.head, "v": self.values.tolist()}
+        if self.scale != 10 ** PRECISION:
+            data["s"] = self.scale
+        return data
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        """
+        Ajoute `value` et retourne la valeur qu'elle remplace (None tant que le tampon n'est pas plein).
+        """
+        if len(self.values) < self.capacity:
+            self._store(len(self.values), value)
+            evicted = None
+        else:
+            evicted = self.values[self.head] / self.scale
+            self._store(self.head, value)
+            self.head = (self.head + 1) % self.capacity
+        return evicted
+
+    def to_list(self):
+        """
+        Valeurs dans l'ordre chronologique.
+        """
+        scale = self.scale
+        return [value / scale for value in self.values[self.head:] + self.values[:self.head]]
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __getitem__(self, index):
+        size = len(self.values)
+        if isinstance(index, slice):
+            return [self.values[(self.head + i) % size] / self.scale for i in range(*index.indices(size))]
+        if index < -size or index >= size:
+            raise IndexError("indice hors de l'historique")
+        return self.values[(self.head + index) % size] / self.scale
+
+    def __repr__(self):
+        return f"RingBuffer({self.to_list()!r}, capacity={self.capacity})"
+
+
+def load_ring_buffer(data, capacity: int):
+    """
+    RingBuffer de capacité `capacity` stocké dans le traderData décodé : `data` est retourné tel
+    quel si c'est déjà un RingBuffer de cette capacité (état mis à jour plus tôt dans le tick),
+    sinon il est relu depuis sa forme sérialisée.
+    """
+    if isinstance(data, RingBuffer):
+        if data.capacity == capacity:
+            return data
+        data = data.to_data()
+    return RingBuffer(data, capacity)
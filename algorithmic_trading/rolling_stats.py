@@ -0,0 +1,56 @@
+"""
+Moyenne et écart-type glissants, mis à jour en temps constant à chaque tick.
+"""
+import math
+
+
+def new_stats(values=()):
+    """
+    Crée l'état des statistiques d'une fenêtre contenant déjà `values`.
+    """
+    stats = {"n": 0, "shift": 0.0, "sum": 0.0, "sumsq": 0.0}
+    for value in values:
+        stats_push(stats, value)
+    return stats
+
+
+def stats_push(stats, value):
+    """
+    Ajoute `value` à la fenêtre.
+    """
+    if stats["n"] == 0:
+        stats["shift"] = value
+    delta = value - stats["shift"]
+    stats["n"] += 1
+    stats["sum"] += delta
+    stats["sumsq"] += delta * delta
+
+
+def stats_pop(stats, value):
+    """
+    Retire de la fenêtre `value`, qui doit en faire partie (en pratique, la plus ancienne valeur).
+    """
+    delta = value - stats["shift"]
+    stats["n"] -= 1
+    stats["sum"] -= delta
+    stats["sumsq"] -= delta * delta
+
+
+def stats_mean(stats) -> float:
+    """
+    Moyenne de la fenêtre (0.0 si elle est vide).
+    """
+    if stats["n"] == 0:
+        return 0.0
+    return stats["shift"] + stats["sum"] / stats["n"]
+
+
+def stats_std(stats) -> float:
+    """
+    Écart-type d'échantillon (diviseur n - 1) de la fenêtre (0.0 pour moins de deux valeurs).
+    """
+    n = stats["n"]
+    if n < 2:
+        return 0.0
+    variance = (stats["sumsq"] - stats["sum"] * stats["sum"] / n) / (n - 1)
+    return math.sqrt(max(variance, 0.0))
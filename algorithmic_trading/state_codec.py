@@ -0,0 +1,129 @@
+"""
+Encodage compact du traderData des stratégies, à la place de jsonpickle.
+
+Le traderData est un dict imbriqué (ex. {"KELP": {"history": [2030.5, 2031.0, ...]}}) :
+la structure est écrite en JSON, mais chaque liste de nombres est remplacée par une chaîne
+"@<type>:<premier>:<base64>" contenant le premier élément puis les écarts successifs,
+mis à l'échelle en entiers (PRECISION décimales) et empaquetés dans le plus petit type
+entier qui convient. Seules les listes que ce format restitue à l'identique sont empaquetées
+(valeurs finies, exactes à PRECISION décimales, écarts tenant sur 64 bits) ; les autres sont
+écrites en JSON. Les chaînes de l'utilisateur commençant par "@" sont précédées d'un "@" de plus.
+Les objets ayant une méthode to_data() (ex. RingBuffer) sont écrits sous la forme qu'elle retourne.
+
+Ce module, comme les autres modules partagés par les stratégies (rolling_stats, ring_buffer,
+indicators, book_view), n'utilise que la bibliothèque standard (autorisée par l'exchange).
+L'exchange n'accepte qu'un fichier par soumission : copier les modules utilisés en tête du
+fichier de stratégie avant de le soumettre.
+"""
+import json
+import math
+from array import array
+from base64 import b64decode, b64encode
+from itertools import accumulate
+
+# Nombre de décimales conservées pour les listes de flottants (les mid prices sont au demi-point)
+PRECISION = 2
+# Taille maximale du traderData acceptée par l'exchange (en caractères)
+TRADER_DATA_LIMIT = 50000
+
+PACKED_PREFIX = "@"
+# Types entiers de array, du plus compact au plus large
+_TYPECODES = (("b", 1 << 7), ("h", 1 << 15), ("i", 1 << 31), ("q", 1 << 63))
+
+
+def _number_kind(values):
+    """
+    "f" pour une liste non vide de flottants (et d'entiers), "i" pour une liste d'entiers, None sinon.
+    """
+    types = set(map(type, values))
+    if not types or not types <= {int, float}:
+        return None
+    return "f" if float in types else "i"
+
+
+def _pack(values, kind):
+    """
+    Chaîne empaquetée de la liste `values`, ou None si elle ne serait pas relue à l'identique.
+    """
+    if kind == "f":
+        scale = 10 ** PRECISION
+        scaled = []
+        for x in values:
+            if not math.isfinite(x * scale):
+                return None
+            scaled_value = round(x * scale)
+            if scaled_value / scale != x:
+                return None
+            scaled.append(scaled_value)
+    else:
+        scaled = list(values)
+    deltas = [b - a for a, b in zip(scaled, scaled[1:])]
+    bound = max(max(deltas, default=0), -min(deltas, default=0))
+    typecode = next((code for code, limit in _TYPECODES if bound < limit), None)
+    if typecode is None:
+        return None
+    if kind == "f":
+        kind = f"f{PRECISION}"
+    payload = b64encode(array(typecode, deltas).tobytes()).decode("ascii")
+    return f"{PACKED_PREFIX}{kind}{typecode}:{scaled[0]}:{payload}"
+
+
+def _unpack(text):
+    header, first, payload = text[len(PACKED_PREFIX):].split(":")
+    typecode = header[-1]
+    deltas = array(typecode)
+    deltas.frombytes(b64decode(payload))
+    values = list(accumulate(deltas, initial=int(first)))
+    if header[0] == "f":
+        scale = 10 ** int(header[1:-1])
+        return [value / scale for value in values]
+    return values
+
+
+def _to_encodable(value):
+    if isinstance(value, dict):
+        return {key: _to_encodable(item) for key, item in value.items()}
+    if hasattr(value, "to_data"):
+        # Objet gardé tel quel pendant le tick (ex. RingBuffer), sérialisé une seule fois ici
+        return _to_encodable(value.to_data())
+    if isinstance(value, (list, tuple)):
+        kind = _number_kind(value)
+        packed = _pack(value, kind) if kind is not None else None
+        if packed is not None:
+            return packed
+        return [_to_encodable(item) for item in value]
+    if isinstance(value, str) and value.startswith(PACKED_PREFIX):
+        return PACKED_PREFIX + value
+    return value
+
+
+def _from_encodable(value):
+    if isinstance(value, dict):
+        return {key: _from_encodable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_from_encodable(item) for item in value]
+    if isinstance(value, str) and value.startswith(PACKED_PREFIX):
+        if value.startswith(PACKED_PREFIX * 2):
+            return value[len(PACKED_PREFIX):]
+        return _unpack(value)
+    return value
+
+
+def encode_trader_data(data) -> str:
+    """
+    Encode le dict `data` en une chaîne compacte pour traderData.
+    Lève ValueError si le résultat dépasse TRADER_DATA_LIMIT caractères.
+    """
+    encoded = json.dumps(_to_encodable(data), separators=(",", ":"))
+    if len(encoded) > TRADER_DATA_LIMIT:
+        raise ValueError(f"traderData trop volumineux : {len(encoded)} caractères (limite {TRADER_DATA_LIMIT})")
+    return encoded
+
+
+def decode_trader_data(text: str):
+    """
+    Décode une chaîne produite par encode_trader_data() ; une chaîne vide donne {}.
+    """
+    if not text:
+        return {}
+    return _from_encodable(json.loads(text))
@@ -1,6 +1,7 @@
-from datamodel import OrderDepth, TradingState, Order
+from datamodel import TradingState, Order
 from typing import List
-import jsonpickle
+from state_codec import encode_trader_data, decode_trader_data
+from book_view import BookView
 import numpy as np
 import math
 
@@ -62,7 +63,7 @@ class Trader:
         fair_value: int,
         take_width: float,
         orders: List[Order],
-        order_depth: OrderDepth,
+        book: BookView,
         position: int,
         buy_order_volume: int,
         sell_order_volume: int,
@@ -72,10 +73,10 @@ class Trader:
         position_limit = self.LIMIT[product]
 
         # Traitement pour les sell_orders : possibilité d'achat
-        if len(order_depth.sell_orders) != 0:
-            best_ask = min(order_depth.sell_orders.keys())
-            # Le volume est négatif, d'où la multiplication par -1 pour obtenir la quantité absolue
-            best_ask_amount = -1 * order_depth.sell_orders[best_ask]
+        if book.asks:
+            best_ask = book.best_ask
+            # La vue donne directement la quantité absolue
+            best_ask_amount = book.best_ask_volume
 
             if not prevent_adverse or abs(best_ask_amount) <= adverse_volume:
                 if best_ask <= fair_value - take_width:
@@ -83,23 +84,19 @@ class Trader:
                     if quantity > 0:
                         orders.append(Order(product, best_ask, quantity))
                         buy_order_volume += quantity
-                        order_depth.sell_orders[best_ask] += quantity
-                        if order_depth.sell_orders[best_ask] == 0:
-                            del order_depth.sell_orders[best_ask]
+                        book.consume_ask(best_ask, quantity)
 
         # Traitement pour les buy_orders : possibilité de vente
-        if len(order_depth.buy_orders) != 0:
-            best_bid = max(order_depth.buy_orders.keys())
-            best_bid_amount = order_depth.buy_orders[best_bid]
+        if book.bids:
+            best_bid = book.best_bid
+            best_bid_amount = book.best_bid_volume
             if not prevent_adverse or abs(best_bid_amount) <= adverse_volume:
                 if best_bid >= fair_value + take_width:
                     quantity = min(best_bid_amount, position_limit + position)
                     if quantity > 0:
                         orders.append(Order(product, best_bid, -quantity))
                         sell_order_volume += quantity
-                        order_depth.buy_orders[best_bid] -= quantity
-                        if order_depth.buy_orders[best_bid] == 0:
-                            del order_depth.buy_orders[best_bid]
+                        book.consume_bid(best_bid, quantity)
         return buy_order_volume, sell_order_volume
 
     def market_make(
@@ -128,7 +125,7 @@ class Trader:
         fair_value: float,
         width: int,
         orders: List[Order],
-        order_depth: OrderDepth,
+        book: BookView,
         position: int,
         buy_order_volume: int,
         sell_order_volume: int,
@@ -142,11 +139,7 @@ class Trader:
 
         if position_after_take > 0:
             # Regroupe les volumes des buy_orders avec un prix supérieur à fair_for_ask
-            clear_quantity = sum(
-                volume
-                for price, volume in order_depth.buy_orders.items()
-                if price >= fair_for_ask
-            )
+            clear_quantity = book.bid_volume_at_or_above(fair_for_ask)
             clear_quantity = min(clear_quantity, position_after_take)
             sent_quantity = min(sell_quantity, clear_quantity)
             if sent_quantity > 0:
@@ -154,11 +147,7 @@ class Trader:
                 sell_order_volume += abs(sent_quantity)
         elif position_after_take < 0:
             # Regroupe les volumes des sell_orders avec un prix inférieur à fair_for_bid
-            clear_quantity = sum(
-                abs(volume)
-                for price, volume in order_depth.sell_orders.items()
-                if price <= fair_for_bid
-            )
+            clear_quantity = book.ask_volume_at_or_below(fair_for_bid)
             clear_quantity = min(clear_quantity, abs(position_after_take))
             sent_quantity = min(buy_quantity, clear_quantity)
             if sent_quantity > 0:
@@ -169,7 +158,7 @@ class Trader:
     def make_orders(
         self,
         product,
-        order_depth: OrderDepth,
+        book: BookView,
         fair_value: float,
         position: int,
         buy_order_volume: int,
@@ -181,21 +170,10 @@ class Trader:
         soft_position_limit: int = 0,
     ):
         orders: List[Order] = []
-        # Sélectionne les sell_orders au-dessus de (fair_value + disregard_edge)
-        asks_above_fair = [
-            price
-            for price in order_depth.sell_orders.keys()
-            if price > fair_value + disregard_edge
-        ]
-        # Sélectionne les buy_orders en-dessous de (fair_value - disregard_edge)
-        bids_below_fair = [
-            price
-            for price in order_depth.buy_orders.keys()
-            if price < fair_value - disregard_edge
-        ]
-
-        best_ask_above_fair = min(asks_above_fair) if asks_above_fair else None
-        best_bid_below_fair = max(bids_below_fair) if bids_below_fair else None
+        # Meilleur sell_order au-dessus de (fair_value + disregard_edge)
+        best_ask_above_fair = book.best_ask_above(fair_value + disregard_edge)
+        # Meilleur buy_order en-dessous de (fair_value - disregard_edge)
+        best_bid_below_fair = book.best_bid_below(fair_value - disregard_edge)
 
         ask = round(fair_value + default_edge)
         if best_ask_above_fair is not None:
@@ -232,7 +210,7 @@ class Trader:
     def take_orders(
         self,
         product: str,
-        order_depth: OrderDepth,
+        book: BookView,
         fair_value: float,
         take_width: float,
         position: int,
@@ -248,7 +226,7 @@ class Trader:
             fair_value,
             take_width,
             orders,
-            order_depth,
+            book,
             position,
             buy_order_volume,
             sell_order_volume,
@@ -260,7 +238,7 @@ class Trader:
     def clear_orders(
         self,
         product: str,
-        order_depth: OrderDepth,
+        book: BookView,
         fair_value: float,
         clear_width: int,
         position: int,
@@ -273,7 +251,7 @@ class Trader:
             fair_value,
             clear_width,
             orders,
-            order_depth,
+            book,
             position,
             buy_order_volume,
             sell_order_volume,
@@ -284,7 +262,7 @@ class Trader:
         # Récupération éventuelle de l'état précédent depuis traderData
         traderObject = {}
         if state.traderData is not None and state.traderData != "":
-            traderObject = jsonpickle.decode(state.traderData)
+            traderObject = decode_trader_data(state.traderData)
         else:
             traderObject = {}
         
@@ -299,13 +277,15 @@ class Trader:
                 # ici nous gardons simplement la valeur prédéfinie.
                 
                 orders_total = []
+                # Vue du carnet partagée par les trois étapes : analysée une seule fois par tick
+                book = BookView(state.order_depths[product])
                 buy_order_volume = 0
                 sell_order_volume = 0
 
                 # Prise d'ordres en se basant sur le carnet (take_orders)
                 take_orders, buy_order_volume, sell_order_volume = self.take_orders(
                     product,
-                    state.order_depths[product],
+                    book,
                     fair_value,
                     self.params[product]["take_width"],
                     position,
@@ -316,7 +296,7 @@ class Trader:
                 # Nettoyage des positions (clear_orders)
                 clear_orders, buy_order_volume, sell_order_volume = self.clear_orders(
                     product,
-                    state.order_depths[product],
+                    book,
                     fair_value,
                     self.params[product]["clear_width"],
                     position,
@@ -327,7 +307,7 @@ class Trader:
                 # Mise en place d'ordres de market making (make_orders)
                 make_orders, _, _ = self.make_orders(
                     product,
-                    state.order_depths[product],
+                    book,
                     fair_value,
                     position,
                     buy_order_volume,
@@ -346,5 +326,5 @@ class Trader:
                 result[product] = orders_total
 
         conversions = 0
-        traderData = jsonpickle.encode(traderObject)
+        traderData = encode_trader_data(traderObject)
         return result, conversions, traderData
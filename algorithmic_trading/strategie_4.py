@@ -1,7 +1,9 @@
-from datamodel import OrderDepth, TradingState, Order, Trade
+from datamodel import TradingState, Order, Trade
 from typing import List, Dict, Tuple
-import jsonpickle
-import math
+from state_codec import encode_trader_data, decode_trader_data
+from book_view import BookView
+from rolling_stats import new_stats, stats_mean, stats_pop, stats_push, stats_std
+from ring_buffer import RingBuffer, load_ring_buffer
 
 ##############################################
 # Fonction d'assistance pour calculer un profit simple
@@ -28,43 +30,54 @@ class ProductStrategy:
         # L'état interne sera stocké dans traderData (par exemple, l'historique des mid prices)
         self.internal_state = {}
 
-    def compute_mid_price(self, order_depth: OrderDepth, fallback: float) -> float:
+    def compute_mid_price(self, book: BookView, fallback: float) -> float:
         """
         Calcule le mid price comme la moyenne entre le meilleur bid et le meilleur ask.
         Si l'un des deux n'est pas disponible, retourne fallback.
         """
-        if order_depth.buy_orders and order_depth.sell_orders:
-            best_bid = max(order_depth.buy_orders.keys())
-            best_ask = min(order_depth.sell_orders.keys())
-            mid = (best_bid + best_ask) / 2.0
+        if book.bids and book.asks:
+            best_bid = book.best_bid
+            best_ask = book.best_ask
+            mid = book.mid_price
             print(f"[{self.product}] Best Bid: {best_bid}, Best Ask: {best_ask}, Calculated Mid: {mid}")
             return mid
         print(f"[{self.product}] Données incomplètes dans le carnet. Fallback utilisé: {fallback}")
         return fallback
 
-    def update_history(self, trader_state: Dict, mid_price: float) -> List[float]:
+    def update_history(self, trader_state: Dict, mid_price: float) -> RingBuffer:
         """
         Met à jour l'historique des mid prices pour ce produit dans trader_state.
-        On conserve ici les 30 dernières valeurs.
+        Sa moyenne et son écart-type glissants (voir rolling_stats) sont mis à jour en temps constant.
+        On conserve ici les `history_window` dernières valeurs (30 par défaut), dans un tampon
+        circulaire (voir ring_buffer) : la plus ancienne valeur est remplacée en place.
         """
-        history = trader_state.get("history", [])
-        history.append(mid_price)
-        if len(history) > 30:
-            history = history[-30:]
+        window = self.params.get("history_window", 30)
+        history = load_ring_buffer(trader_state.get("history"), window)
         trader_state["history"] = history
+        stats = trader_state.get("stats")
+        if not stats or stats["n"] != len(history):
+            stats = new_stats(history)
+        evicted = history.append(mid_price)
+        # Valeur telle que stockée (arrondie à la précision de l'historique)
+        stats_push(stats, history[-1])
+        if evicted is not None:
+            stats_pop(stats, evicted)
+        trader_state["stats"] = stats
         print(f"[{self.product}] Historique mis à jour: {history[-3:]} ... (taille: {len(history)})")
         return history
 
-    def rolling_average(self, history: List[float]) -> float:
-        if history:
-            avg = sum(history) / len(history)
+    def rolling_average(self, trader_state: Dict) -> float:
+        stats = trader_state.get("stats")
+        if stats and stats["n"]:
+            avg = stats_mean(stats)
             print(f"[{self.product}] Moyenne historique calculée: {avg}")
             return avg
         return 0.0
 
-    def rolling_std(self, history: List[float], avg: float) -> float:
-        if len(history) > 1:
-            std = math.sqrt(sum((x - avg) ** 2 for x in history) / (len(history) - 1))
+    def rolling_std(self, trader_state: Dict) -> float:
+        stats = trader_state.get("stats")
+        if stats and stats["n"] > 1:
+            std = stats_std(stats)
             print(f"[{self.product}] Ecart-type calculé: {std}")
             return std
         return 0.0
@@ -79,32 +92,32 @@ class ProductStrategy:
         print(f"[{self.product}] Quantité max à vendre autorisée: {qty}")
         return qty
 
-    def run_strategy(self, order_depth: OrderDepth, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
+    def run_strategy(self, book: BookView, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
         """
         Par défaut, la stratégie applique la logique basique.
         Les classes dérivées peuvent surcharger cette méthode.
         """
         orders = []
         default_fair = self.params.get("fair_value", 100)
-        fair_value = self.compute_mid_price(order_depth, default_fair)
-        orders.extend(self.basic_orders(fair_value, order_depth, position))
+        fair_value = self.compute_mid_price(book, default_fair)
+        orders.extend(self.basic_orders(fair_value, book, position))
         return orders, trader_state
 
-    def basic_orders(self, fair_value: float, order_depth: OrderDepth, position: int) -> List[Order]:
+    def basic_orders(self, fair_value: float, book: BookView, position: int) -> List[Order]:
         """
         Logique simple : Si le meilleur ask est inférieur à fair_value, on passe un ordre d'achat ;
         si le meilleur bid est supérieur à fair_value, on passe un ordre de vente.
         """
         orders = []
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders.keys())
+        if book.asks:
+            best_ask = book.best_ask
             if best_ask < fair_value:
                 qty = self.allowed_buy_quantity(position)
                 if qty > 0:
                     orders.append(Order(self.product, best_ask, qty))
                     print(f"[{self.product}] Basic BUY order: {qty} à {best_ask}")
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders.keys())
+        if book.bids:
+            best_bid = book.best_bid
             if best_bid > fair_value:
                 qty = self.allowed_sell_quantity(position)
                 if qty > 0:
@@ -125,14 +138,14 @@ class RainforestResinStrategy(ProductStrategy):
         self.volatility_coeff = self.params.get("volatility_coeff", 0.1)  # Coefficient pour ajuster l'offset avec la volatilité
         self.inventory_skew = self.params.get("inventory_skew", 10)  # Coefficient pour ajuster l'offset selon la position
 
-    def run_strategy(self, order_depth: OrderDepth, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
+    def run_strategy(self, book: BookView, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
         orders = []
         default_fair = self.params.get("fair_value", 10000)
         # Calcul du mid price et mise à jour de l'historique externe (dans trader_state)
-        mid = self.compute_mid_price(order_depth, default_fair)
+        mid = self.compute_mid_price(book, default_fair)
         history = self.update_history(trader_state, mid)
-        avg = self.rolling_average(history)
-        std = self.rolling_std(history, avg)
+        avg = self.rolling_average(trader_state)
+        std = self.rolling_std(trader_state)
         
         # Calcul dynamique de l'offset en fonction de la volatilité (écart-type)
         dynamic_offset = self.base_offset + self.volatility_coeff * std
@@ -195,14 +208,14 @@ class KelpStrategy(ProductStrategy):
         self.bollinger_multiplier = self.params.get("bollinger_multiplier", 1.5)
         self.min_trade_threshold = self.params.get("min_trade_threshold", 0.2)  # Seuil minimal pour déclencher un trade
 
-    def run_strategy(self, order_depth: OrderDepth, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
+    def run_strategy(self, book: BookView, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
         orders = []
         default_fair = self.params.get("fair_value", 2000)
         # Calcul du mid price et mise à jour de l'historique
-        mid = self.compute_mid_price(order_depth, default_fair)
+        mid = self.compute_mid_price(book, default_fair)
         history = self.update_history(trader_state, mid)
-        avg = self.rolling_average(history)
-        std = self.rolling_std(history, avg)
+        avg = self.rolling_average(trader_state)
+        std = self.rolling_std(trader_state)
         
         # Calcul des bandes de Bollinger
         lower_band = avg - self.bollinger_multiplier * std
@@ -268,15 +281,15 @@ class SquidInkStrategy(ProductStrategy):
         self.bollinger_multiplier = self.params.get("bollinger_multiplier", 1.5)
         self.min_trade_threshold = self.params.get("min_trade_threshold", 0.2)
 
-    def run_strategy(self, order_depth: OrderDepth, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
+    def run_strategy(self, book: BookView, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
         orders = []
         default_fair = self.params.get("fair_value", 2000)
         
         # Calcul du mid price et mise à jour de l'historique dans le trader_state
-        mid = self.compute_mid_price(order_depth, default_fair)
+        mid = self.compute_mid_price(book, default_fair)
         history = self.update_history(trader_state, mid)
-        avg = self.rolling_average(history)
-        std = self.rolling_std(history, avg)
+        avg = self.rolling_average(trader_state)
+        std = self.rolling_std(trader_state)
         
         # Calcul des bandes de Bollinger
         lower_band = avg - self.bollinger_multiplier * std
@@ -367,7 +380,7 @@ class Trader:
         # Chargement de l'état précédent depuis traderData
         trader_data = {}
         if state.traderData and state.traderData != "":
-            trader_data = jsonpickle.decode(state.traderData)
+            trader_data = decode_trader_data(state.traderData)
             print("État précédent chargé depuis traderData.")
         else:
             trader_data = {}
@@ -380,7 +393,7 @@ class Trader:
                 print(f"\n--- Traitement du produit: {product} ---")
                 prod_state = trader_data.get(product, {})
                 orders, updated_state = strategy.run_strategy(
-                    state.order_depths[product],
+                    BookView(state.order_depths[product]),
                     state.position.get(product, 0),
                     state.observations,
                     prod_state
@@ -389,7 +402,7 @@ class Trader:
                 trader_data[product] = updated_state
                 print(f"[{product}] Ordres générés: {orders}")
 
-        new_trader_data = jsonpickle.encode(trader_data)
+        new_trader_data = encode_trader_data(trader_data)
         conversions = 0  # Aucune conversion dans cet exemple
         print("=== Fin de l'exécution du Trader ===\n")
         return result, conversions, new_trader_data
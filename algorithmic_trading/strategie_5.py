@@ -1,7 +1,10 @@
-from datamodel import OrderDepth, TradingState, Order, Trade
+from datamodel import TradingState, Order, Trade
 from typing import List, Dict, Tuple
-import jsonpickle
-import math
+from state_codec import encode_trader_data, decode_trader_data
+from book_view import BookView
+from rolling_stats import new_stats, stats_mean, stats_pop, stats_push, stats_std
+from ring_buffer import RingBuffer, load_ring_buffer
+from indicators import RSI_SIMPLE, new_rsi, new_slope, rsi_update, rsi_value, slope_update, slope_value
 
 ##############################################
 # Classe de base pour la stratégie par produit
@@ -14,43 +17,54 @@ class ProductStrategy:
         # L'état interne est prévu pour stocker, par exemple, l'historique des mid prices.
         self.internal_state = {}
 
-    def compute_mid_price(self, order_depth: OrderDepth, fallback: float) -> float:
+    def compute_mid_price(self, book: BookView, fallback: float) -> float:
         """
         Calcule le mid price comme la moyenne entre le meilleur bid et le meilleur ask.
         Si l'un des deux n'est pas disponible, retourne fallback.
         """
-        if order_depth.buy_orders and order_depth.sell_orders:
-            best_bid = max(order_depth.buy_orders.keys())
-            best_ask = min(order_depth.sell_orders.keys())
-            mid = (best_bid + best_ask) / 2.0
+        if book.bids and book.asks:
+            best_bid = book.best_bid
+            best_ask = book.best_ask
+            mid = book.mid_price
             print(f"[{self.product}] Best Bid: {best_bid}, Best Ask: {best_ask}, Calculated Mid: {mid}")
             return mid
         print(f"[{self.product}] Données incomplètes dans le carnet. Fallback utilisé: {fallback}")
         return fallback
 
-    def update_history(self, trader_state: Dict, mid_price: float) -> List[float]:
+    def update_history(self, trader_state: Dict, mid_price: float) -> RingBuffer:
         """
         Met à jour l'historique des mid prices pour ce produit dans trader_state.
-        On conserve ici les 30 dernières valeurs.
+        Sa moyenne et son écart-type glissants (voir rolling_stats) sont mis à jour en temps constant.
+        On conserve ici les `history_window` dernières valeurs (30 par défaut), dans un tampon
+        circulaire (voir ring_buffer) : la plus ancienne valeur est remplacée en place.
         """
-        history = trader_state.get("history", [])
-        history.append(mid_price)
-        if len(history) > 30:
-            history = history[-30:]
+        window = self.params.get("history_window", 30)
+        history = load_ring_buffer(trader_state.get("history"), window)
         trader_state["history"] = history
+        stats = trader_state.get("stats")
+        if not stats or stats["n"] != len(history):
+            stats = new_stats(history)
+        evicted = history.append(mid_price)
+        # Valeur telle que stockée (arrondie à la précision de l'historique)
+        stats_push(stats, history[-1])
+        if evicted is not None:
+            stats_pop(stats, evicted)
+        trader_state["stats"] = stats
         print(f"[{self.product}] Historique mis à jour: {history[-3:]} ... (taille: {len(history)})")
         return history
 
-    def rolling_average(self, history: List[float]) -> float:
-        if history:
-            avg = sum(history) / len(history)
+    def rolling_average(self, trader_state: Dict) -> float:
+        stats = trader_state.get("stats")
+        if stats and stats["n"]:
+            avg = stats_mean(stats)
             print(f"[{self.product}] Moyenne historique calculée: {avg}")
             return avg
         return 0.0
 
-    def rolling_std(self, history: List[float], avg: float) -> float:
-        if len(history) > 1:
-            std = math.sqrt(sum((x - avg) ** 2 for x in history) / (len(history) - 1))
+    def rolling_std(self, trader_state: Dict) -> float:
+        stats = trader_state.get("stats")
+        if stats and stats["n"] > 1:
+            std = stats_std(stats)
             print(f"[{self.product}] Ecart-type calculé: {std}")
             return std
         return 0.0
@@ -65,32 +79,32 @@ class ProductStrategy:
         print(f"[{self.product}] Quantité max à vendre autorisée: {qty}")
         return qty
 
-    def run_strategy(self, order_depth: OrderDepth, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
+    def run_strategy(self, book: BookView, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
         """
         Logique par défaut : on applique la méthode basique.
         Les stratégies dérivées surchargeront cette méthode.
         """
         orders = []
         default_fair = self.params.get("fair_value", 100)
-        fair_value = self.compute_mid_price(order_depth, default_fair)
-        orders.extend(self.basic_orders(fair_value, order_depth, position))
+        fair_value = self.compute_mid_price(book, default_fair)
+        orders.extend(self.basic_orders(fair_value, book, position))
         return orders, trader_state
 
-    def basic_orders(self, fair_value: float, order_depth: OrderDepth, position: int) -> List[Order]:
+    def basic_orders(self, fair_value: float, book: BookView, position: int) -> List[Order]:
         """
         Logique simple : si le meilleur ask est inférieur à fair_value, on passe un ordre d'achat ;
         si le meilleur bid est supérieur à fair_value, on passe un ordre de vente.
         """
         orders = []
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders.keys())
+        if book.asks:
+            best_ask = book.best_ask
             if best_ask < fair_value:
                 qty = self.allowed_buy_quantity(position)
                 if qty > 0:
                     orders.append(Order(self.product, best_ask, qty))
                     print(f"[{self.product}] Basic BUY order: {qty} à {best_ask}")
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders.keys())
+        if book.bids:
+            best_bid = book.best_bid
             if best_bid > fair_value:
                 qty = self.allowed_sell_quantity(position)
                 if qty > 0:
@@ -110,27 +124,24 @@ class RainforestResinStrategy(ProductStrategy):
         self.inventory_skew = self.params.get("inventory_skew", 10)
         self.imbalance_coeff = self.params.get("imbalance_coeff", 0.5)
 
-    def compute_orderbook_imbalance(self, order_depth: OrderDepth) -> float:
-        # Calcule l'imbalance : (volume acheteur - volume vendeur) / volume total
-        buy_vol = sum(order_depth.buy_orders.values()) if order_depth.buy_orders else 0
-        sell_vol = sum(abs(v) for v in order_depth.sell_orders.values()) if order_depth.sell_orders else 0
-        total = buy_vol + sell_vol
-        if total > 0:
-            imbalance = (buy_vol - sell_vol) / total
+    def compute_orderbook_imbalance(self, book: BookView) -> float:
+        # Imbalance : (volume acheteur - volume vendeur) / volume total, mémorisée par la vue du carnet
+        if book.total_bid_volume + book.total_ask_volume > 0:
+            imbalance = book.imbalance
             print(f"[{self.product}] Imbalance calculé: {imbalance}")
             return imbalance
         return 0.0
 
-    def run_strategy(self, order_depth: OrderDepth, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
+    def run_strategy(self, book: BookView, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
         orders = []
         default_fair = self.params.get("fair_value", 10000)
-        mid = self.compute_mid_price(order_depth, default_fair)
+        mid = self.compute_mid_price(book, default_fair)
         history = self.update_history(trader_state, mid)
-        avg = self.rolling_average(history)
-        std = self.rolling_std(history, avg)
+        avg = self.rolling_average(trader_state)
+        std = self.rolling_std(trader_state)
         
         dynamic_offset = self.base_offset + self.volatility_coeff * std
-        imbalance = self.compute_orderbook_imbalance(order_depth)
+        imbalance = self.compute_orderbook_imbalance(book)
         dynamic_offset += self.imbalance_coeff * imbalance * std
         
         if position > 0:
@@ -184,38 +195,41 @@ class KelpStrategy(ProductStrategy):
         self.rsi_period = self.params.get("rsi_period", 14)
         self.rsi_oversold = self.params.get("rsi_oversold", 30)
         self.rsi_overbought = self.params.get("rsi_overbought", 70)
+        self.rsi_mode = self.params.get("rsi_mode", RSI_SIMPLE)
 
-    def compute_rsi(self, history: List[float]) -> float:
-        if len(history) < self.rsi_period + 1:
+    def compute_rsi(self, trader_state: Dict, history: RingBuffer) -> float:
+        """
+        RSI du mid price, mis à jour en temps constant dans trader_state["rsi"] (voir indicators) :
+        moyenne simple sur les `rsi_period` dernières variations ("simple", par défaut) ou
+        lissage de Wilder ("wilder"), selon le paramètre rsi_mode. Un état absent ou dont la
+        période ou le mode ont changé est reconstruit à partir de l'historique.
+        """
+        rsi_state = trader_state.get("rsi")
+        if not rsi_state or rsi_state["period"] != self.rsi_period or rsi_state["mode"] != self.rsi_mode:
+            rsi_state = new_rsi(self.rsi_period, self.rsi_mode)
+            for value in history:
+                rsi_update(rsi_state, value)
+        else:
+            rsi_update(rsi_state, history[-1])
+        trader_state["rsi"] = rsi_state
+        rsi = rsi_value(rsi_state)
+        if rsi is None:
             return 50  # Valeur neutre
-        gains = []
-        losses = []
-        for i in range(-self.rsi_period, 0):
-            change = history[i] - history[i - 1]
-            if change > 0:
-                gains.append(change)
-            else:
-                losses.append(abs(change))
-        avg_gain = sum(gains) / self.rsi_period if gains else 0
-        avg_loss = sum(losses) / self.rsi_period if losses else 0
-        if avg_loss == 0:
-            return 100
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        print(f"[KELP] RSI calculé: {rsi}")
+        if rsi != 100:
+            print(f"[KELP] RSI calculé: {rsi}")
         return rsi
 
-    def run_strategy(self, order_depth: OrderDepth, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
+    def run_strategy(self, book: BookView, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
         orders = []
         default_fair = self.params.get("fair_value", 2000)
-        mid = self.compute_mid_price(order_depth, default_fair)
+        mid = self.compute_mid_price(book, default_fair)
         history = self.update_history(trader_state, mid)
-        avg = self.rolling_average(history)
-        std = self.rolling_std(history, avg)
+        avg = self.rolling_average(trader_state)
+        std = self.rolling_std(trader_state)
         lower_band = avg - self.bollinger_multiplier * std
         upper_band = avg + self.bollinger_multiplier * std
         print(f"[KELP] Mid: {mid}, Moyenne: {avg}, Std: {std}, Lower band: {lower_band}, Upper band: {upper_band}")
-        rsi = self.compute_rsi(history)
+        rsi = self.compute_rsi(trader_state, history)
         print(f"[KELP] RSI: {rsi}")
         trade_qty = 0
         signal = 0  # 1 pour achat, -1 pour vente
@@ -263,26 +277,33 @@ class SquidInkStrategy(ProductStrategy):
         self.momentum_window = self.params.get("momentum_window", 5)
         self.momentum_threshold = self.params.get("momentum_threshold", 0.5)
 
-    def compute_momentum(self, history: List[float]) -> float:
+    def compute_momentum(self, trader_state: Dict, history: RingBuffer) -> float:
+        """
+        Pente de la régression linéaire des `momentum_window` derniers mid prices, mise à jour en
+        temps constant dans trader_state["momentum"] (voir indicators). Un état absent ou dont
+        la fenêtre a changé est reconstruit à partir de l'historique.
+        """
         n = self.momentum_window
-        if len(history) < n:
+        slope_state = trader_state.get("momentum")
+        if not slope_state or slope_state["window"] != n:
+            slope_state = new_slope(n)
+            for value in history:
+                slope_update(slope_state, value)
+        else:
+            slope_update(slope_state, history[-1])
+        trader_state["momentum"] = slope_state
+        slope = slope_value(slope_state)
+        if slope is None:
             return 0
-        x_vals = list(range(n))
-        y_vals = history[-n:]
-        mean_x = sum(x_vals) / n
-        mean_y = sum(y_vals) / n
-        num = sum((x - mean_x) * (y - mean_y) for x, y in zip(x_vals, y_vals))
-        den = sum((x - mean_x) ** 2 for x in x_vals)
-        slope = num / den if den != 0 else 0
         print(f"[SQUID_INK] Momentum (pente) calculé sur {n} points: {slope}")
         return slope
 
-    def run_strategy(self, order_depth: OrderDepth, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
+    def run_strategy(self, book: BookView, position: int, observation, trader_state: Dict) -> (List[Order], Dict):
         orders = []
         default_fair = self.params.get("fair_value", 2000)
-        mid = self.compute_mid_price(order_depth, default_fair)
+        mid = self.compute_mid_price(book, default_fair)
         history = self.update_history(trader_state, mid)
-        momentum = self.compute_momentum(history)
+        momentum = self.compute_momentum(trader_state, history)
         if abs(momentum) < self.momentum_threshold:
             print(f"[SQUID_INK] Momentum trop faible ({momentum}). Aucun trade.")
             return orders, trader_state
@@ -343,7 +364,7 @@ class Trader:
         
         # Chargement de l'état précédent depuis traderData
         if state.traderData and state.traderData != "":
-            trader_data = jsonpickle.decode(state.traderData)
+            trader_data = decode_trader_data(state.traderData)
             print("État précédent chargé depuis traderData.")
         else:
             trader_data = {}
@@ -355,7 +376,7 @@ class Trader:
                 print(f"\n--- Traitement du produit: {product} ---")
                 prod_state = trader_data.get(product, {})
                 orders, updated_state = strategy.run_strategy(
-                    state.order_depths[product],
+                    BookView(state.order_depths[product]),
                     state.position.get(product, 0),
                     state.observations,
                     prod_state
@@ -364,7 +385,7 @@ class Trader:
                 trader_data[product] = updated_state
                 print(f"[{product}] Ordres générés: {orders}")
         
-        new_trader_data = jsonpickle.encode(trader_data)
+        new_trader_data = encode_trader_data(trader_data)
         conversions = 0  # Aucune conversion dans cet exemple
         print("=== Fin de l'exécution du Trader ===\n")
         return result, conversions, new_trader_data
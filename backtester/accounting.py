@@ -0,0 +1,199 @@
+# backtester/accounting.py
+import numpy as np
+
+from matching_engine import SUBMISSION
+
+
+def mid_price_arrays(books, timestamps):
+    """
+    Mid price (meilleur bid + meilleur ask) / 2 de chaque produit à chaque timestamp de
+    `timestamps`, calculé sur les tableaux de extract_book_arrays(). Lorsqu'un carnet est vide
+    d'un côté ou absent à un timestamp, le dernier mid connu est reporté (NaN avant le premier).
+    Retourne {produit: tableau (n_ticks,)}.
+    """
+    mids = {}
+    for product, arrays in books.items():
+        best_bid = np.where(arrays["bid_valid"], arrays["bid_prices"], -np.inf).max(axis=1)
+        best_ask = np.where(arrays["ask_valid"], arrays["ask_prices"], np.inf).min(axis=1)
+        book_mid = np.where(np.isfinite(best_bid) & np.isfinite(best_ask), (best_bid + best_ask) / 2, np.nan)
+
+        mid = np.full(len(timestamps), np.nan)
+        rows = np.searchsorted(timestamps, arrays["timestamp"])
+        mid[rows] = book_mid
+        # Report du dernier mid connu sur les ticks sans mid
+        known = np.where(np.isfinite(mid), np.arange(len(mid)), 0)
+        np.maximum.accumulate(known, out=known)
+        mids[product] = mid[known]
+    return mids
+
+
+def ledger_arrays(ledger):
+    """
+    Convertit le journal de trades en tableaux NumPy, sans boucle Python par trade :
+    timestamp du tick de chaque trade, produit (nom et indice dans "products", la liste triée des
+    produits du journal), prix et quantité signée (positive à l'achat).
+    """
+    n = len(ledger.trades)
+    counts = np.diff(np.asarray(ledger.offsets, dtype=np.int64))
+    tick_timestamps = np.repeat(np.asarray(ledger.timestamps, dtype=np.int64), counts)
+    symbols = np.fromiter((trade.symbol for trade in ledger.trades), dtype=object, count=n)
+    prices = np.fromiter((trade.price for trade in ledger.trades), dtype=np.float64, count=n)
+    quantities = np.fromiter((trade.quantity for trade in ledger.trades), dtype=np.int64, count=n)
+    buys = np.fromiter((trade.buyer == SUBMISSION for trade in ledger.trades), dtype=bool, count=n)
+    products, product_index = np.unique(symbols.astype(str), return_inverse=True)
+    return {
+        "timestamp": tick_timestamps,
+        "symbol": symbols,
+        "products": products.tolist(),
+        "product": product_index.astype(np.int64),
+        "price": prices,
+        "quantity": np.where(buys, quantities, -quantities),
+    }
+
+
+# Taille des blocs de _affine_scan
+_SCAN_BLOCK = 64
+
+
+def _affine_scan(factors, offsets):
+    """
+    Résout la récurrence y[k] = factors[k] * y[k - 1] + offsets[k] (avec y[-1] = 0 et des facteurs
+    entre 0 et 1) par blocs de _SCAN_BLOCK éléments. Dans un bloc, y[k] est la somme des offsets[j]
+    depuis le dernier facteur nul, pondérés par le produit des facteurs de j + 1 à k, obtenu comme
+    rapport de produits cumulés : les blocs courts gardent ces produits loin de zéro. Seule la
+    valeur de sortie d'un bloc est ensuite reportée sur le suivant (une itération par bloc).
+    """
+    n = len(factors)
+    pad = -n % _SCAN_BLOCK
+    factors = np.concatenate((factors, np.ones(pad))).reshape(-1, _SCAN_BLOCK)
+    offsets = np.concatenate((offsets, np.zeros(pad))).reshape(-1, _SCAN_BLOCK)
+    zero = factors == 0
+    products = np.cumprod(np.where(zero, 1.0, factors), axis=1)
+    sums = np.cumsum(offsets / products, axis=1)
+    last_zero = np.maximum.accumulate(np.where(zero, np.arange(_SCAN_BLOCK), -1), axis=1)
+    before = np.where(last_zero > 0, np.take_along_axis(sums, np.maximum(last_zero - 1, 0), axis=1), 0.0)
+    values = products * (sums - before)
+    # Poids de la valeur d'entrée du bloc (nul après un facteur nul)
+    carried = np.where(last_zero < 0, products, 0.0)
+    incoming = 0.0
+    for block in range(len(values)):
+        values[block] += carried[block] * incoming
+        incoming = values[block, -1]
+    return values.ravel()[:n]
+
+
+def _realized_by_trade(prices, quantities):
+    """
+    PnL réalisé par chaque trade (méthode du coût moyen) : seule la partie qui réduit la
+    position réalise un gain ou une perte, par rapport au prix moyen d'entrée.
+    Le prix moyen suit une récurrence linéaire, résolue par _affine_scan : un trade qui augmente
+    la position p en p' donne moyenne' = moyenne × p / p' + prix × quantité / p' (facteur nul en
+    partant de zéro), un trade qui la réduit laisse la moyenne inchangée et un retournement de
+    position la remplace par le prix du trade.
+    """
+    if len(prices) == 0:
+        return np.zeros(0)
+    quantities = np.asarray(quantities)
+    positions = np.cumsum(quantities)
+    previous = positions - quantities
+    side = np.sign(previous)
+    reducing = (side != 0) & (np.sign(quantities) == -side)
+    flipping = reducing & (np.sign(positions) == -side)
+    closed = np.where(reducing, np.minimum(np.abs(quantities), np.abs(previous)), 0)
+
+    adding = ~reducing
+    safe_positions = np.where(adding & (positions != 0), positions, 1)
+    factors = np.where(adding, previous / safe_positions, np.where(flipping, 0.0, 1.0))
+    offsets = np.where(adding, prices * quantities / safe_positions, np.where(flipping, prices, 0.0))
+    average_after = _affine_scan(factors, offsets)
+    # Prix moyen de la position avant chaque trade : celui qui suit le trade précédent
+    average_before = np.concatenate(([0.0], average_after[:-1]))
+    return closed * (prices - average_before) * side
+
+
+def _max_drawdown(values):
+    if len(values) == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(np.maximum(values, 0))
+    return float((peaks - values).max())
+
+
+def _sharpe(values):
+    """
+    Ratio de type Sharpe sur les variations tick à tick du PnL : moyenne / écart-type,
+    multiplié par la racine du nombre de ticks (ratio sur l'ensemble de la période).
+    """
+    returns = np.diff(values, prepend=0.0)
+    std = returns.std()
+    if len(returns) < 2 or std == 0:
+        return 0.0
+    return float(returns.mean() / std * np.sqrt(len(returns)))
+
+
+def compute_accounting(ledger, books):
+    """
+    Comptabilité d'une simulation, calculée en tableaux NumPy à partir du journal de trades et
+    des carnets (tableaux de load_day_arrays) : pour chaque produit et chaque tick, position,
+    cash, valeur de l'inventaire au mid, PnL réalisé, latent et total.
+    Retourne {"timestamp": (n_ticks,), "total_pnl": (n_ticks,), "products": {produit: {"position",
+    "cash", "mid", "inventory_value", "realized", "unrealized", "pnl"}}}, chaque entrée étant un
+    tableau (n_ticks,).
+    """
+    if not books:
+        return {"timestamp": np.array([], dtype=np.int64), "total_pnl": np.array([]), "products": {}}
+    timestamps = np.unique(np.concatenate([arrays["timestamp"] for arrays in books.values()]))
+    mids = mid_price_arrays(books, timestamps)
+    trades = ledger_arrays(ledger)
+    ticks = np.searchsorted(timestamps, trades["timestamp"])
+    n_ticks = len(timestamps)
+
+    products = {}
+    total_pnl = np.zeros(n_ticks)
+    product_index = {product: i for i, product in enumerate(trades["products"])}
+    for product in books:
+        mask = trades["product"] == product_index.get(product, -1)
+        product_ticks = ticks[mask]
+        prices = trades["price"][mask]
+        quantities = trades["quantity"][mask]
+
+        position = np.cumsum(np.bincount(product_ticks, weights=quantities, minlength=n_ticks)).astype(np.int64)
+        cash = np.cumsum(np.bincount(product_ticks, weights=-quantities * prices, minlength=n_ticks))
+        realized = np.cumsum(np.bincount(product_ticks, weights=_realized_by_trade(prices, quantities), minlength=n_ticks))
+        # Une position nulle ne vaut rien, même sans mid connu
+        inventory_value = np.where(position != 0, position * np.nan_to_num(mids[product]), 0.0)
+        pnl = cash + inventory_value
+        products[product] = {
+            "position": position,
+            "cash": cash,
+            "mid": mids[product],
+            "inventory_value": inventory_value,
+            "realized": realized,
+            "unrealized": pnl - realized,
+            "pnl": pnl,
+        }
+        total_pnl += pnl
+    return {"timestamp": timestamps, "total_pnl": total_pnl, "products": products}
+
+
+def accounting_summary(accounting):
+    """
+    Résumé d'une comptabilité : PnL final (total, réalisé, latent), position finale, drawdown
+    maximal et ratio de type Sharpe, par produit et au total.
+    """
+    summary = {"products": {}}
+    for product, arrays in accounting["products"].items():
+        summary["products"][product] = {
+            "pnl": float(arrays["pnl"][-1]) if len(arrays["pnl"]) else 0.0,
+            "realized": float(arrays["realized"][-1]) if len(arrays["realized"]) else 0.0,
+            "unrealized": float(arrays["unrealized"][-1]) if len(arrays["unrealized"]) else 0.0,
+            "position": int(arrays["position"][-1]) if len(arrays["position"]) else 0,
+            "max_drawdown": _max_drawdown(arrays["pnl"]),
+            "sharpe": _sharpe(arrays["pnl"]),
+        }
+    total_pnl = accounting["total_pnl"]
+    summary.update({
+        "pnl": float(total_pnl[-1]) if len(total_pnl) else 0.0,
+        "max_drawdown": _max_drawdown(total_pnl),
+        "sharpe": _sharpe(total_pnl),
+    })
+    return summary
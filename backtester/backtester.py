@@ -1,105 +1,265 @@
 # backtester/backtester.py
-from state_builder import build_complete_trading_states
+from state_builder import iter_states_from_arrays, load_day_arrays
 from sample_trader import SimpleTrader
+from strategy_loader import load_trader
+from matching_engine import PASSIVE_FILL_ALL, NextTickTrades, execute_orders, get_position_limits
+from trade_ledger import TradeLedger
+from accounting import accounting_summary, compute_accounting
+from controllers.report_controller import TradingStateWriter
+from log_capture import LOG_CAPTURE, LOG_DISCARD, BoundedLogBuffer, NullWriter, SandboxLogWriter
+from checkpoint import load_checkpoint, save_checkpoint
+from models.datamodel import OrderDepth, TradingState
+import contextlib
+import itertools
 import os
+import time
+import numpy as np
 import pandas as pd
-import json
 from tabulate import tabulate
 
+# Temps maximal accordé par l'exchange à un appel de Trader.run (en secondes)
+TIME_BUDGET = 0.9
+
+CHECKPOINT_FILE = os.path.join("backtester", "reports", "checkpoint.pkl")
+
 def save_trading_states(trading_states, file_path):
     """
-    Sauvegarde la liste d'objets TradingState dans un fichier JSON.
+    Sauvegarde les objets TradingState dans un rapport NDJSON delta (voir TradingStateWriter),
+    relisible avec read_trading_states(). `trading_states` peut être n'importe quel itérable,
+    y compris un générateur : les états sont écrits un par un, sans construire la liste en mémoire.
     """
-    states_list = [json.loads(state.toJSON()) for state in trading_states]
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(states_list, f, indent=4)
+    with TradingStateWriter(file_path) as writer:
+        writer.write_all(trading_states)
     print(f"\nTradingStates saved to '{file_path}'.")
 
-def run_backtest(product: str, day: int):
-    """
-    Fonction de backtest minimal :
-      - Charge la série historique d'états de marché pour le produit et le jour donnés.
-      - Le premier TradingState sert d'état d'origine.
-      - Pour chaque tick, la stratégie du SimpleTrader est exécutée sur l'état courant.
-      - L'état suivant est mis à jour avec les modifications (position, own_trades) issues des décisions de l'algo.
-      - Un log chronologique de simulation est généré.
-    """
-    # Charger la série d'états historiques (snapshots) pour le produit et le jour spécifiés
-    historical_states = build_complete_trading_states(product, day)
-    if not historical_states:
-        print("Aucun état historique chargé.")
-        return
-
-    # Sauvegarder les états historiques initiaux pour référence
-    initial_states_file = os.path.join("backtester", "reports", "initial_trading_states.json")
-    save_trading_states(historical_states, initial_states_file)
+def _stdout_target(log_mode, log_writer=None):
+    if log_mode == LOG_CAPTURE and log_writer is not None:
+        return BoundedLogBuffer()
+    if log_mode in (LOG_CAPTURE, LOG_DISCARD):
+        return NullWriter()
+    return None
 
-    # Instanciation de la stratégie (votre trader simple)
-    trader = SimpleTrader()
+def _redirect_stdout(target):
+    return contextlib.nullcontext() if target is None else contextlib.redirect_stdout(target)
 
-    # Log de simulation : pour chaque tick, on enregistrera l'état et l'action réalisée
-    simulation_log = []
+def _trader_view(state):
+    """
+    État passé à trader.run : les champs de `state`, avec une copie de chaque carnet. Une stratégie
+    peut ainsi consommer les volumes de son OrderDepth (ex. strategie.py, via BookView) sans retirer
+    la liquidité contre laquelle le moteur exécute ensuite ses ordres.
+    """
+    order_depths = {}
+    for product, order_depth in state.order_depths.items():
+        copy = OrderDepth()
+        copy.buy_orders = dict(order_depth.buy_orders)
+        copy.sell_orders = dict(order_depth.sell_orders)
+        order_depths[product] = copy
+    return TradingState(state.traderData, state.timestamp, state.listings, order_depths, state.own_trades,
+                        state.market_trades, state.position, state.observations)
 
+def simulate_trading_states(historical_states, trader, simulation_log, ledger, limits=None, time_budget=None, abort_on_timeout=False,
+                            log_mode=LOG_CAPTURE, trade_arrays=None, passive_fill=PASSIVE_FILL_ALL, checkpoint_every=None,
+                            on_checkpoint=None, resumed=False, log_writer=None):
+    """
+    Rejoue les états historiques un par un et les retourne (générateur) une fois simulés :
+      - Le premier TradingState sert d'état d'origine.
+      - Pour chaque tick, la stratégie du trader est exécutée sur l'état courant (avec sa propre
+        copie des carnets, voir _trader_view) et ses ordres sont exécutés par le moteur
+        d'appariement (matching_engine.execute_orders) contre les carnets d'origine, avec les
+        limites de position `limits` (par défaut celles du trader, voir get_position_limits).
+        Les ordres restants sont confrontés aux trades de marché du tick suivant selon le modèle
+        `passive_fill`, lus dans `trade_arrays` (tableaux de load_day_arrays) s'ils sont fournis,
+        sinon dans le market_trades de l'état suivant.
+      - Les trades exécutés sont ajoutés au journal `ledger` (TradeLedger) ; comme sur l'exchange,
+        le own_trades de l'état suivant ne contient que les trades du tick qui vient d'être joué.
+      - Un log chronologique de simulation est ajouté à `simulation_log`, limité pour chaque tick
+        à son timestamp, à la durée de l'appel à trader.run ("run_time", en secondes) et à la
+        taille du traderData qu'il a retourné ("trader_data_size", en caractères) : les ordres
+        et positions ne sont pas conservés (les trades sont dans `ledger`).
+      - Si `time_budget` (en secondes) est donné, les ticks qui le dépassent sont signalés
+        ("over_budget") ; avec abort_on_timeout=True la simulation s'arrête au premier dépassement,
+        comme l'exchange qui coupe un trader trop lent.
+      - Les print du trader et du moteur sont, selon `log_mode` : capturés par tick dans un buffer
+        borné et écrits dès la fin du tick par `log_writer` ("lambdaLog" / "sandboxLog", comme sur
+        l'exchange, voir log_capture.SandboxLogWriter ; LOG_CAPTURE, ignorés sans `log_writer`),
+        ignorés (LOG_DISCARD) ou laissés sur le terminal (LOG_PRINT).
+      - Tous les `checkpoint_every` ticks, `on_checkpoint(state)` est appelé avec le prochain état
+        à jouer, déjà mis à jour (voir checkpoint.save_checkpoint). Avec resumed=True, le premier
+        état est un état restauré d'un checkpoint : la simulation continue le journal existant au
+        lieu de repartir d'un état initial.
+    Seuls l'état courant et l'état suivant sont gardés en mémoire, en plus du journal des trades
+    et de ces quelques valeurs par tick.
+    """
+    if limits is None:
+        limits = get_position_limits(trader)
+    historical_states = iter(historical_states)
     # On considère le premier état historique comme état initial de simulation
-    simulated_state = historical_states[0]
-    simulation_log.append({
-        "timestamp": simulated_state.timestamp,
-        "action": "Initial state",
-        "position": simulated_state.position.copy(),
-        "own_trades": simulated_state.own_trades.copy()
-    })
+    simulated_state = next(historical_states, None)
+    if simulated_state is None:
+        return
+    if not resumed:
+        simulation_log.append({"timestamp": simulated_state.timestamp})
 
     # Parcourir les états historiques suivants (par ordre chronologique)
-    for next_state in historical_states[1:]:
+    for next_state in historical_states:
         # Exécuter la stratégie sur l'état courant et récupérer le résultat (ordres à passer)
-        result, conversions, traderData = trader.run(simulated_state)
-        
-        # Appliquer les actions de l'algo à l'état courant.
-        # Ici, nous simulons simplement une exécution immédiate : chaque ordre
-        # modifie directement la position et ajoute un trade fictif dans own_trades.
-        for prod, orders in result.items():
-            for order in orders:
-                if order.quantity > 0:
-                    # Ordre d'achat : position augmente et on ajoute un trade d'achat
-                    simulated_state.position[prod] += order.quantity
-                    simulated_state.own_trades[prod].append({
-                        "price": order.price,
-                        "quantity": order.quantity,
-                        "side": "BUY",
-                        "timestamp": simulated_state.timestamp
-                    })
-                else:
-                    # Ordre de vente : position diminue et on ajoute un trade de vente
-                    simulated_state.position[prod] += order.quantity  # quantity est négative
-                    simulated_state.own_trades[prod].append({
-                        "price": order.price,
-                        "quantity": order.quantity,
-                        "side": "SELL",
-                        "timestamp": simulated_state.timestamp
-                    })
+        lambda_log = _stdout_target(log_mode, log_writer)
+        trader_state = _trader_view(simulated_state)
+        with _redirect_stdout(lambda_log):
+            start = time.perf_counter()
+            result, conversions, traderData = trader.run(trader_state)
+            run_time = time.perf_counter() - start
+        over_budget = time_budget is not None and run_time > time_budget
+
+        # Exécuter les ordres contre le carnet du tick courant puis contre les trades de
+        # marché du tick suivant, en respectant les limites de position.
+        sandbox_log = _stdout_target(log_mode, log_writer)
+        with _redirect_stdout(sandbox_log):
+            if trade_arrays is not None:
+                next_tick_trades = NextTickTrades(next_state.timestamp, trade_arrays=trade_arrays)
+            else:
+                next_tick_trades = NextTickTrades(next_state.timestamp, market_trades=next_state.market_trades)
+            fills = execute_orders(simulated_state, result, limits, next_tick_trades, passive_fill)
+        ledger.record(simulated_state.timestamp, fills)
 
         # Enregistrer les résultats du tick courant dans le log
         simulation_log.append({
             "timestamp": simulated_state.timestamp,
-            "action": result,
-            "position": simulated_state.position.copy(),
-            "own_trades": simulated_state.own_trades.copy()
+            "run_time": run_time,
+            "over_budget": over_budget,
+            "trader_data_size": len(traderData or "")
         })
+        if log_mode == LOG_CAPTURE and log_writer is not None:
+            log_writer.write(simulated_state.timestamp, sandbox_log.getvalue(), lambda_log.getvalue())
+        if over_budget:
+            print(f"[{simulated_state.timestamp}] Trader.run a pris {run_time * 1000:.1f} ms (budget : {time_budget * 1000:.0f} ms)")
+            if abort_on_timeout:
+                print("Simulation interrompue : budget de temps dépassé.")
+                yield simulated_state
+                return
         
-        # Mettre à jour l'état suivant avec la position et l'historique cumulés
+        # Mettre à jour l'état suivant avec la position, les trades du tick courant
+        # et le traderData retourné par la stratégie
+        next_state.traderData = traderData
         for prod in simulated_state.position:
             next_state.position[prod] = simulated_state.position[prod]
-            next_state.own_trades[prod] = simulated_state.own_trades[prod].copy()
+            next_state.own_trades[prod] = fills.get(prod, [])
+        if on_checkpoint is not None and checkpoint_every and len(ledger.timestamps) % checkpoint_every == 0:
+            on_checkpoint(next_state)
         
-        # Le tick suivant devient l'état simulé courant
+        # L'état courant est terminé ; le tick suivant devient l'état simulé courant
+        yield simulated_state
         simulated_state = next_state
 
-    # Enregistrer l'état simulé final dans un fichier JSON
-    simulated_states_file = os.path.join("backtester", "reports", "simulated_trading_states.json")
-    save_trading_states(historical_states, simulated_states_file)
+    yield simulated_state
+
+def timing_summary(simulation_log):
+    """
+    Statistiques des durées de Trader.run relevées dans `simulation_log` (en millisecondes) :
+    nombre d'appels, moyenne, p50, p95, p99, max et nombre de ticks hors budget.
+    """
+    run_times = np.array([entry["run_time"] for entry in simulation_log if "run_time" in entry]) * 1000
+    if run_times.size == 0:
+        return {"calls": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "over_budget": 0}
+    p50, p95, p99 = np.percentile(run_times, [50, 95, 99]).tolist()
+    return {
+        "calls": int(run_times.size),
+        "mean": float(run_times.mean()),
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "max": float(run_times.max()),
+        "over_budget": sum(1 for entry in simulation_log if entry.get("over_budget")),
+    }
+
+def run_backtest(products, day: int, strategy_path=None, checkpoint_every=None, checkpoint_path=CHECKPOINT_FILE, resume_from=None,
+                 time_budget=TIME_BUDGET, abort_on_timeout=False):
+    """
+    Fonction de backtest minimal :
+      - Charge la série historique d'états de marché pour le(s) produit(s) et le jour donnés
+        (un nom de produit, une liste de produits ou "all"), en un seul parsing par jour.
+      - Rejoue ces états avec le Trader du fichier de stratégie `strategy_path` (ex.
+        algorithmic_trading/strategie_5.py, voir strategy_loader), ou le SimpleTrader par défaut
+        (voir simulate_trading_states).
+      - Les états historiques et simulés sont matérialisés et écrits au fil de l'eau : seuls les
+        tableaux de marché de la journée sont gardés en mémoire.
+      - Les appels à Trader.run qui dépassent `time_budget` (en secondes, None : pas de budget)
+        sont signalés ; avec abort_on_timeout=True la simulation s'arrête au premier dépassement.
+      - Calcule la comptabilité de la simulation (PnL, drawdown, Sharpe ; voir accounting) et
+        retourne son résumé (voir accounting_summary).
+      - Avec `checkpoint_every`, un checkpoint est écrit dans `checkpoint_path` tous les
+        `checkpoint_every` ticks ; avec `resume_from` (chemin d'un checkpoint), la simulation
+        reprend au tick sauvegardé, avec le trader et le journal du checkpoint, sans rejouer les
+        ticks précédents. La stratégie est celle du checkpoint (si `strategy_path` est donné, il
+        doit être le même). Le rapport des états simulés, les logs et les durées de Trader.run ne
+        couvrent alors que la suite ; le PnL couvre toute la journée.
+    """
+    if isinstance(products, str) and products != "all":
+        products = [products]
+
+    # Charger les tableaux de marché (carnets et trades) pour les produits et le jour spécifiés
+    books, trades = load_day_arrays(products, day)
+    if not books:
+        print("Aucun état historique chargé.")
+        return
+    metadata = {"products": sorted(books), "day": day,
+                "strategy_path": os.path.abspath(strategy_path) if strategy_path is not None else None}
+
+    # Log de simulation : pour chaque tick, on enregistrera l'état et l'action réalisée
+    simulation_log = []
+    if resume_from is not None:
+        # Reprise : trader, journal et état suivant restaurés depuis le checkpoint
+        checkpoint = load_checkpoint(resume_from)
+        if strategy_path is None:
+            metadata["strategy_path"] = checkpoint["metadata"].get("strategy_path")
+        if checkpoint["metadata"] != metadata:
+            print(f"Checkpoint '{resume_from}' incompatible : {checkpoint['metadata']} (attendu {metadata})")
+            return
+        trader = checkpoint["trader"]
+        ledger = checkpoint["ledger"]
+        resumed_state = checkpoint["state"]
+        historical_states = itertools.chain([resumed_state], iter_states_from_arrays(books, trades, start_timestamp=resumed_state.timestamp + 1))
+        print(f"Reprise depuis '{resume_from}' au timestamp {resumed_state.timestamp}.")
+    else:
+        # Sauvegarder les états historiques initiaux pour référence
+        initial_states_file = os.path.join("backtester", "reports", "initial_trading_states.ndjson")
+        save_trading_states(iter_states_from_arrays(books, trades), initial_states_file)
+
+        # Instanciation de la stratégie (le trader simple si aucun fichier n'est donné)
+        trader = load_trader(strategy_path) if strategy_path is not None else SimpleTrader()
+
+        # Journal de tous les trades exécutés pendant la simulation
+        ledger = TradeLedger()
+        historical_states = iter_states_from_arrays(books, trades)
+
+    def on_checkpoint(state):
+        save_checkpoint(checkpoint_path, state, trader, ledger, metadata)
+
+    # Rejouer la série d'états historiques et enregistrer les états simulés dans un rapport,
+    # et les logs capturés pendant la simulation au format de l'exchange, tick par tick
+    simulated_states_file = os.path.join("backtester", "reports", "simulated_trading_states.ndjson")
+    with SandboxLogWriter(os.path.join("backtester", "reports", "sandbox_logs.log")) as log_writer:
+        simulated_states = simulate_trading_states(historical_states, trader, simulation_log, ledger, time_budget=time_budget,
+                                                   abort_on_timeout=abort_on_timeout, trade_arrays=trades,
+                                                   checkpoint_every=checkpoint_every, on_checkpoint=on_checkpoint, resumed=resume_from is not None,
+                                                   log_writer=log_writer)
+        save_trading_states(simulated_states, simulated_states_file)
+
+    # PnL par produit (cash + inventaire au mid), drawdown et ratio de type Sharpe
+    summary = accounting_summary(compute_accounting(ledger, books))
+    rows = [[product, values["position"], round(values["realized"], 1), round(values["unrealized"], 1), round(values["pnl"], 1),
+             round(values["max_drawdown"], 1), round(values["sharpe"], 2)] for product, values in summary["products"].items()]
+    rows.append(["TOTAL", "", "", "", round(summary["pnl"], 1), round(summary["max_drawdown"], 1), round(summary["sharpe"], 2)])
+    print(tabulate(rows, headers=["Produit", "Position", "PnL réalisé", "PnL latent", "PnL", "Drawdown max", "Sharpe"]))
+
+    # Durées d'exécution de Trader.run
+    timings = timing_summary(simulation_log)
+    print(tabulate([[round(value, 3) if isinstance(value, float) else value for value in timings.values()]],
+                   headers=["Appels", "Moyenne (ms)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)", "Hors budget"]))
+    return summary
 
 if __name__ == '__main__':
-    product = "RAINFOREST_RESIN"  # Exemple : "RAINFOREST_RESIN", "KELP", "SQUID_INK"
-    day = 0                      # À adapter selon vos données
-    run_backtest(product, day)
\ No newline at end of file
+    products = ["RAINFOREST_RESIN"]  # Exemple : ["RAINFOREST_RESIN", "KELP", "SQUID_INK"] ou "all"
+    day = 0                          # À adapter selon vos données
+    strategy_path = None             # Exemple : "algorithmic_trading/strategie_5.py" (None : SimpleTrader)
+    run_backtest(products, day, strategy_path)
\ No newline at end of file
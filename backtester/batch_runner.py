@@ -0,0 +1,148 @@
+# backtester/batch_runner.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tabulate import tabulate
+
+from state_builder import iter_states_from_arrays, load_day_arrays
+from backtester import TIME_BUDGET, simulate_trading_states, timing_summary
+from accounting import accounting_summary, compute_accounting
+from trade_ledger import TradeLedger
+from strategy_loader import load_trader, preload_strategies
+from log_capture import LOG_DISCARD, LOG_PRINT
+from controllers.csv_controller import load_market_data_by_product
+from controllers.trade_controller import load_trades_data_by_product
+
+STRATEGY_DIR = os.path.join(os.path.dirname(__file__), '../algorithmic_trading')
+
+
+def simulate_with_pnl(trader, books, trades, quiet=True, time_budget=TIME_BUDGET, abort_on_timeout=False):
+    """
+    Rejoue la journée décrite par les tableaux (books, trades) de load_day_arrays() avec `trader`,
+    sans écrire de rapport, puis calcule sa comptabilité (voir accounting.compute_accounting).
+    Retourne un résumé : PnL et position finale par produit, drawdown maximal et ratio de type
+    Sharpe du PnL total, nombre de trades et de ticks, et durées de Trader.run (voir timing_summary).
+    Avec quiet=True, les print de la stratégie sont ignorés. `time_budget` et `abort_on_timeout`
+    sont passés à simulate_trading_states.
+    """
+    ledger = TradeLedger()
+    simulation_log = []
+    log_mode = LOG_DISCARD if quiet else LOG_PRINT
+    for _ in simulate_trading_states(iter_states_from_arrays(books, trades), trader, simulation_log, ledger,
+                                     time_budget=time_budget, abort_on_timeout=abort_on_timeout, log_mode=log_mode,
+                                     trade_arrays=trades):
+        pass
+
+    summary = accounting_summary(compute_accounting(ledger, books))
+    return {
+        "pnl": {product: values["pnl"] for product, values in summary["products"].items()},
+        "position": {product: values["position"] for product, values in summary["products"].items()},
+        "max_drawdown": summary["max_drawdown"],
+        "sharpe": summary["sharpe"],
+        "trades": len(ledger),
+        "ticks": len(simulation_log),
+        "timings": timing_summary(simulation_log),
+    }
+
+
+# Tableaux de marché préchargés par processus : {(produits, jour): (books, trades)}
+_PRELOADED_DAYS = {}
+
+
+def _products_key(products):
+    return products if isinstance(products, str) or products is None else tuple(products)
+
+
+def preload_days(days, products="all"):
+    """
+    Charge une fois pour toutes les tableaux de marché des jours demandés dans le processus courant
+    (utilisé comme initializer des workers) ; les backtests suivants ne font que les rejouer.
+    """
+    for day in days:
+        key = (_products_key(products), day)
+        if key not in _PRELOADED_DAYS:
+            _PRELOADED_DAYS[key] = load_day_arrays(products, day)
+
+
+def get_day_arrays(products, day: int):
+    """
+    Tableaux (books, trades) d'une journée : ceux préchargés par preload_days() s'ils existent,
+    sinon chargés depuis le cache CSV.
+    """
+    arrays = _PRELOADED_DAYS.get((_products_key(products), day))
+    if arrays is None:
+        return load_day_arrays(products, day)
+    return arrays
+
+
+def run_backtest_cell(strategy_path, day: int, products="all", params=None, quiet=True, time_budget=TIME_BUDGET,
+                      abort_on_timeout=False):
+    """
+    Exécute une cellule de la matrice (une stratégie, un jour, un ensemble de produits) sans
+    écrire de rapport, et retourne un résumé (voir simulate_with_pnl) complété de la durée.
+    """
+    start = time.perf_counter()
+    trader = load_trader(strategy_path, params)
+    summary = simulate_with_pnl(trader, *get_day_arrays(products, day), quiet, time_budget, abort_on_timeout)
+    summary.update({
+        "strategy": os.path.splitext(os.path.basename(strategy_path))[0],
+        "day": day,
+        "products": products if isinstance(products, str) else ", ".join(products),
+        "seconds": time.perf_counter() - start,
+    })
+    return summary
+
+
+def warm_cache(days):
+    """
+    Construit le cache des fichiers de prix et de trades des jours demandés dans le processus
+    courant, pour que les workers ne fassent que le lire (et ne le reconstruisent pas en parallèle).
+    """
+    for day in days:
+        load_market_data_by_product(None, day)
+        load_trades_data_by_product(None, day)
+
+
+def run_backtest_matrix(strategy_paths, days, products_list=("all",), max_workers=None):
+    """
+    Exécute chaque cellule (stratégie, jour, produits) de la matrice dans un ProcessPoolExecutor
+    et retourne la liste des résumés (voir run_backtest_cell), dans l'ordre de la matrice.
+    Chaque worker importe les stratégies une seule fois (voir strategy_loader).
+    """
+    warm_cache(days)
+    cells = [(strategy_path, day, products) for strategy_path in strategy_paths for day in days for products in products_list]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=preload_strategies, initargs=(strategy_paths,)) as executor:
+        futures = [executor.submit(run_backtest_cell, *cell) for cell in cells]
+        return [future.result() for future in futures]
+
+
+def format_summary(results):
+    """
+    Met en forme les résumés de run_backtest_matrix en un tableau (une ligne par cellule).
+    """
+    rows = []
+    for result in results:
+        rows.append([
+            result["strategy"],
+            result["day"],
+            result["products"],
+            round(sum(result["pnl"].values()), 1),
+            ", ".join(f"{product}: {round(pnl, 1)}" for product, pnl in result["pnl"].items()),
+            ", ".join(f"{product}: {position}" for product, position in result["position"].items()),
+            round(result["max_drawdown"], 1),
+            round(result["sharpe"], 2),
+            result["trades"],
+            round(result["seconds"], 2),
+            *(round(result["timings"][key], 2) for key in ("p50", "p95", "p99", "max")),
+            result["timings"]["over_budget"],
+        ])
+    headers = ["Stratégie", "Jour", "Produits", "PnL total", "PnL par produit", "Positions", "Drawdown max", "Sharpe", "Trades", "Durée (s)",
+               "run p50 (ms)", "run p95 (ms)", "run p99 (ms)", "run max (ms)", "Hors budget"]
+    return tabulate(rows, headers=headers)
+
+
+if __name__ == '__main__':
+    strategies = [os.path.join(STRATEGY_DIR, name) for name in ("strategie.py", "strategie_2.py", "strategie_3.py", "strategie_4.py", "strategie_5.py")]
+    days = [-2, -1, 0]
+    print(format_summary(run_backtest_matrix(strategies, days)))
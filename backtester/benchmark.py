@@ -0,0 +1,139 @@
+# backtester/benchmark.py
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+from controllers.csv_controller import load_market_data
+from controllers.trade_controller import load_trades_data
+from controllers.report_controller import TradingStateWriter
+from state_builder import build_complete_trading_states
+from backtester import simulate_trading_states
+from sample_trader import SimpleTrader
+from trade_ledger import TradeLedger
+from log_capture import LOG_DISCARD
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(__file__), 'benchmarks')
+RESULTS_FILE = os.path.join(BENCHMARK_DIR, 'latest.json')
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+DAYS = [-2, -1, 0]
+PRODUCTS = ["RAINFOREST_RESIN", "KELP", "SQUID_INK"]
+# Au-delà de ce ratio (temps actuel / temps de référence), une mesure est signalée comme régression
+REGRESSION_THRESHOLD = 1.10
+
+
+def time_call(func, repeat: int, setup=None):
+    """
+    Exécute `func` `repeat` fois et retourne la médiane et le minimum des durées (en secondes).
+    `setup`, s'il est donné, est appelé hors chronométrage avant chaque exécution et son
+    résultat est passé à `func`.
+    """
+    durations = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - start)
+    return {"median": statistics.median(durations), "min": min(durations)}
+
+
+def _simulate(states):
+    for _ in simulate_trading_states(states, SimpleTrader(), [], TradeLedger(), log_mode=LOG_DISCARD):
+        pass
+
+
+def _write_report(states):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with TradingStateWriter(os.path.join(tmp_dir, "states.ndjson")) as writer:
+            writer.write_all(states)
+
+
+def run_benchmarks(days=DAYS, products=PRODUCTS, repeat: int = 5):
+    """
+    Chronomètre chaque étape du chemin de données pour chaque (jour, produit) :
+    parsing CSV des prix et des trades (sans cache), lecture depuis le cache, construction des
+    TradingState, boucle de simulation (SimpleTrader) et écriture du rapport.
+    Retourne {"environment": ..., "results": {"étape/jour/produit": {"median", "min"}}}.
+    """
+    results = {}
+    for day in days:
+        for product in products:
+            key = f"{day}/{product}"
+            # Le premier appel construit le cache si nécessaire : il n'est pas chronométré
+            load_market_data(product, day)
+            load_trades_data(product, day)
+            results[f"load_market_data_csv/{key}"] = time_call(lambda: load_market_data(product, day, use_cache=False), repeat)
+            results[f"load_market_data_cache/{key}"] = time_call(lambda: load_market_data(product, day), repeat)
+            results[f"load_trades_data_csv/{key}"] = time_call(lambda: load_trades_data(product, day, use_cache=False), repeat)
+            results[f"load_trades_data_cache/{key}"] = time_call(lambda: load_trades_data(product, day), repeat)
+            build = lambda: build_complete_trading_states(product, day)
+            results[f"build_states/{key}"] = time_call(build, repeat)
+            results[f"simulate/{key}"] = time_call(_simulate, repeat, setup=build)
+            results[f"write_report/{key}"] = time_call(_write_report, repeat, setup=build)
+    return {
+        "environment": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def save_results(results, file_path):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nRésultats enregistrés dans '{file_path}'.")
+
+
+def compare_results(current, baseline, threshold: float = REGRESSION_THRESHOLD):
+    """
+    Compare les médianes de deux exécutions et retourne une ligne par mesure :
+    [mesure, référence (ms), actuel (ms), ratio, statut].
+    """
+    rows = []
+    for name, timing in current["results"].items():
+        reference = baseline["results"].get(name) if baseline else None
+        if reference is None:
+            rows.append([name, None, timing["median"] * 1000, None, "nouveau"])
+            continue
+        ratio = timing["median"] / reference["median"] if reference["median"] > 0 else float("inf")
+        status = "RÉGRESSION" if ratio > threshold else ("amélioration" if ratio < 1 / threshold else "")
+        rows.append([name, reference["median"] * 1000, timing["median"] * 1000, ratio, status])
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark du chemin de données du backtester")
+    parser.add_argument("--repeat", type=int, default=5, help="nombre d'exécutions par mesure (médiane retenue)")
+    parser.add_argument("--days", type=int, nargs="+", default=DAYS)
+    parser.add_argument("--products", nargs="+", default=PRODUCTS)
+    parser.add_argument("--output", default=RESULTS_FILE, help="fichier JSON des résultats")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="fichier JSON de référence pour la comparaison")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistre aussi les résultats comme nouvelle référence")
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.days, args.products, args.repeat)
+    save_results(current, args.output)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(tabulate(compare_results(current, baseline), headers=["Mesure", "Référence (ms)", "Actuel (ms)", "Ratio", "Statut"], floatfmt=".2f"))
+
+    if args.save_baseline:
+        save_results(current, args.baseline)
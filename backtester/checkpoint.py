@@ -0,0 +1,65 @@
+# backtester/checkpoint.py
+import os
+import pickle
+import random
+
+import numpy as np
+
+from strategy_loader import load_strategy_module
+
+CHECKPOINT_VERSION = 2
+
+
+def save_checkpoint(file_path, state, trader, ledger, metadata=None):
+    """
+    Enregistre un point de reprise d'une simulation, entre deux ticks :
+      - `state` : le prochain TradingState à jouer, déjà mis à jour (position, own_trades,
+        traderData du tick précédent) ;
+      - l'objet `trader` (avec ses attributs internes), le journal de trades `ledger` et l'état
+        des générateurs aléatoires (random et numpy.random) ;
+      - `metadata` : informations libres (produits, jour, fichier de stratégie...) vérifiées à la
+        reprise. Elles sont écrites avant le reste, pour que load_checkpoint() puisse importer le
+        fichier de stratégie "strategy_path" avant de relire le trader.
+    Le log de simulation n'est pas sauvegardé : il grossit à chaque tick, et la reprise en commence un nouveau.
+    Le fichier est écrit puis renommé : un crash pendant l'écriture laisse le checkpoint précédent intact.
+    """
+    header = {"version": CHECKPOINT_VERSION, "metadata": metadata or {}}
+    checkpoint = {
+        "state": state,
+        "trader": trader,
+        "ledger": ledger,
+        "random_state": random.getstate(),
+        "numpy_random_state": np.random.get_state(),
+    }
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, file_path)
+
+
+def load_checkpoint(file_path, restore_random=True):
+    """
+    Relit un checkpoint écrit par save_checkpoint() et retourne son contenu (dict, avec "version"
+    et "metadata"). Si les métadonnées donnent un fichier de stratégie ("strategy_path"), il est
+    importé d'abord (voir strategy_loader.load_strategy_module), pour que le trader puisse être
+    relu dans un nouveau processus.
+    Avec restore_random=True, l'état des générateurs aléatoires est restauré, pour que la suite
+    de la simulation soit identique à celle de l'exécution d'origine.
+    """
+    with open(file_path, "rb") as f:
+        header = pickle.load(f)
+        if header.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Version de checkpoint non supportée : {header.get('version')} (attendue {CHECKPOINT_VERSION})")
+        strategy_path = header["metadata"].get("strategy_path")
+        if strategy_path is not None:
+            load_strategy_module(strategy_path)
+        checkpoint = pickle.load(f)
+    checkpoint.update(header)
+    if restore_random:
+        random.setstate(checkpoint["random_state"])
+        np.random.set_state(checkpoint["numpy_random_state"])
+    return checkpoint
@@ -0,0 +1,198 @@
+# controllers/cache_controller.py
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Dossier de cache par défaut (celui du backtester ; l'application web passe le sien)
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '../cache')
+# À incrémenter si le format des fichiers de cache change
+CACHE_VERSION = 1
+
+
+def _file_signature(filepath):
+    stat = os.stat(filepath)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _file_hash(filepath):
+    sha1 = hashlib.sha1()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def get_cache_dir(filepath, cache_dir=CACHE_DIR):
+    """
+    Dossier de cache d'un fichier source dans `cache_dir` : nom du CSV + empreinte de son chemin
+    absolu, pour éviter les collisions entre deux fichiers homonymes.
+    """
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    path_digest = hashlib.sha1(os.path.abspath(filepath).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{name}_{path_digest}")
+
+
+def _write_meta(cache_dir, meta):
+    meta_path = os.path.join(cache_dir, "meta.json")
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=4)
+    os.replace(tmp_path, meta_path)
+
+
+def _load_valid_meta(filepath, group_column, cache_dir=CACHE_DIR):
+    """
+    Retourne les métadonnées du cache si elles correspondent encore au fichier source, sinon None.
+    Le couple (mtime, taille) suffit dans le cas courant ; si le mtime a changé (checkout, copie...),
+    on compare l'empreinte SHA-1 du contenu avant de décider de reconstruire le cache.
+    """
+    cache_dir = get_cache_dir(filepath, cache_dir)
+    meta_path = os.path.join(cache_dir, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("version") != CACHE_VERSION or meta.get("group_column") != group_column:
+        return None
+
+    signature = _file_signature(filepath)
+    if signature["mtime_ns"] == meta["mtime_ns"] and signature["size"] == meta["size"]:
+        return meta
+    if signature["size"] == meta["size"] and _file_hash(filepath) == meta["sha1"]:
+        meta.update(signature)
+        _write_meta(cache_dir, meta)
+        return meta
+    return None
+
+
+def _save_frame(df, path):
+    """
+    Sauvegarde un DataFrame colonne par colonne dans un fichier NPZ (sans pickle).
+    Les colonnes texte sont stockées en chaînes fixes accompagnées d'un masque des valeurs manquantes.
+    """
+    arrays = {"index": df.index.to_numpy()}
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            arrays[f"c{i}"] = values.to_numpy()
+        else:
+            arrays[f"m{i}"] = values.isna().to_numpy()
+            arrays[f"c{i}"] = values.fillna("").astype(str).to_numpy(dtype=str)
+    np.savez(path, **arrays)
+
+
+def _load_frame(path, columns, dtypes):
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {}
+        text_columns = []
+        for i, col in enumerate(columns):
+            values = data[f"c{i}"]
+            if f"m{i}" in data:
+                values = values.astype(object)
+                values[data[f"m{i}"]] = np.nan
+                text_columns.append(col)
+            arrays[col] = values
+        df = pd.DataFrame(arrays, index=data["index"], columns=columns)
+    for col in text_columns:
+        df[col] = df[col].astype(dtypes[col])
+    return df
+
+
+def build_cache(filepath, group_column, cache_dir=CACHE_DIR):
+    """
+    Parse le CSV source une seule fois et écrit un fichier NPZ par valeur de `group_column`
+    (un par produit), ainsi qu'un meta.json décrivant la source et les colonnes.
+    Retourne le DataFrame complet et les métadonnées.
+    """
+    df = pd.read_csv(filepath, sep=';')
+    cache_dir = get_cache_dir(filepath, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    groups = {}
+    for i, (group, df_group) in enumerate(df.groupby(group_column, sort=False)):
+        filename = f"group_{i}.npz"
+        _save_frame(df_group, os.path.join(cache_dir, filename))
+        groups[str(group)] = filename
+
+    meta = {
+        "version": CACHE_VERSION,
+        "source": os.path.abspath(filepath),
+        "sha1": _file_hash(filepath),
+        "group_column": group_column,
+        "columns": list(df.columns),
+        "dtypes": {col: str(df[col].dtype) for col in df.columns},
+        "groups": groups,
+    }
+    meta.update(_file_signature(filepath))
+    _write_meta(cache_dir, meta)
+    return df, meta
+
+
+def load_cached_groups(filepath, group_column, groups=None, cache_dir=CACHE_DIR):
+    """
+    Retourne un dict {groupe: DataFrame} pour les valeurs `groups` de la colonne `group_column`
+    (toutes les valeurs du fichier si groups vaut None), en ne parsant le CSV qu'une seule fois
+    lorsque le cache doit être (re)construit. Les groupes absents du fichier sont omis.
+    """
+    meta = _load_valid_meta(filepath, group_column, cache_dir)
+    if meta is None:
+        try:
+            df, meta = build_cache(filepath, group_column, cache_dir)
+        except OSError as e:
+            # Cache non inscriptible : on se contente du parsing classique
+            print(f"Impossible d'écrire le cache pour {filepath}: {e}")
+            df = pd.read_csv(filepath, sep=';')
+        frames = {str(group): df_group for group, df_group in df.groupby(group_column, sort=False)}
+        if groups is None:
+            return frames
+        return {str(group): frames[str(group)] for group in groups if str(group) in frames}
+
+    if groups is None:
+        groups = list(meta["groups"])
+    cache_dir = get_cache_dir(filepath, cache_dir)
+    return {
+        str(group): _load_frame(os.path.join(cache_dir, meta["groups"][str(group)]), meta["columns"], meta["dtypes"])
+        for group in groups
+        if str(group) in meta["groups"]
+    }
+
+
+def load_cached_csv(filepath, group_column, group, cache_dir=CACHE_DIR):
+    """
+    Retourne les lignes du CSV `filepath` dont la colonne `group_column` vaut `group`,
+    identiques à un pd.read_csv suivi d'un filtre, mais lues depuis le cache colonnaire.
+    Le cache est (re)construit au premier appel ou lorsque le fichier source a changé.
+    """
+    frames = load_cached_groups(filepath, group_column, [group], cache_dir)
+    if str(group) in frames:
+        return frames[str(group)]
+    meta = _load_valid_meta(filepath, group_column, cache_dir)
+    if meta is None:
+        # Cache non inscriptible : filtre direct sur le CSV
+        df = pd.read_csv(filepath, sep=';')
+        return df[df[group_column].astype(str) == str(group)]
+    # Groupe absent : frame vide avec les colonnes et les types du CSV, comme un filtre sans résultat
+    return pd.DataFrame(
+        {col: pd.Series(dtype=meta["dtypes"][col]) for col in meta["columns"]},
+        index=pd.Index([], dtype=np.int64)
+    )
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """
+    Supprime tous les fichiers de cache de `cache_dir` (ils seront reconstruits au prochain chargement).
+    """
+    if not os.path.isdir(cache_dir):
+        return
+    for root, dirs, files in os.walk(cache_dir, topdown=False):
+        for name in files:
+            os.remove(os.path.join(root, name))
+        for name in dirs:
+            os.rmdir(os.path.join(root, name))
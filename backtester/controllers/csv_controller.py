@@ -1,6 +1,7 @@
 # app/controllers/csv_controller.py
 import pandas as pd
 import os
+from controllers.cache_controller import load_cached_csv, load_cached_groups
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '../../web_app/data/csv')
 
@@ -12,10 +13,12 @@ def get_market_filename(day):
     else:
         return f"prices_round_1_day_{day}.csv"
 
-def load_market_data(product, day):
+def load_market_data(product, day, use_cache=True):
     filename = get_market_filename(day)
     filepath = os.path.join(DATA_DIR, filename)
     try:
+        if use_cache:
+            return load_cached_csv(filepath, 'product', product)
         df = pd.read_csv(filepath, sep=';')
         # Filtrer sur le produit souhaité
         df_product = df[df['product'] == product]
@@ -23,4 +26,22 @@ def load_market_data(product, day):
     except Exception as e:
         print(f"Erreur lors du chargement du fichier {filepath}: {e}")
         return pd.DataFrame()  # Retourne un DataFrame vide en cas d'erreur
-    
+
+def load_market_data_by_product(products, day, use_cache=True):
+    """
+    Charge le fichier de marché du jour une seule fois et retourne un dict {produit: DataFrame}
+    pour les produits demandés (tous les produits du fichier si products vaut None).
+    """
+    filename = get_market_filename(day)
+    filepath = os.path.join(DATA_DIR, filename)
+    try:
+        if use_cache:
+            return load_cached_groups(filepath, 'product', products)
+        df = pd.read_csv(filepath, sep=';')
+        frames = {product: df_product for product, df_product in df.groupby('product', sort=False)}
+        if products is None:
+            return frames
+        return {product: frames[product] for product in products if product in frames}
+    except Exception as e:
+        print(f"Erreur lors du chargement du fichier {filepath}: {e}")
+        return {}
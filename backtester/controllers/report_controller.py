@@ -0,0 +1,160 @@
+# controllers/report_controller.py
+import json
+import os
+
+from models.datamodel import to_serializable, TradingState, OrderDepth, Listing, Observation, ConversionObservation, Trade
+
+REPORT_FORMAT = "trading_states_delta"
+# À incrémenter si le format des rapports change
+REPORT_VERSION = 1
+
+# Champs par produit : seuls les produits modifiés sont écrits (null = produit retiré)
+PRODUCT_FIELDS = ("listings", "order_depths", "own_trades", "market_trades", "position")
+# Champs écrits en entier lorsqu'ils changent
+PLAIN_FIELDS = ("traderData", "observations")
+
+
+def _encode(value):
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def _trade_to_dict(trade):
+    return {
+        "symbol": trade.symbol,
+        "price": trade.price,
+        "quantity": trade.quantity,
+        "buyer": trade.buyer,
+        "seller": trade.seller,
+        "timestamp": trade.timestamp,
+    }
+
+
+def _encode_product_field(field, value):
+    """
+    Encode chaque produit d'un champ de TradingState séparément : {produit: json}.
+    """
+    if field == "listings":
+        return {product: _encode(to_serializable(listing)) for product, listing in value.items()}
+    if field == "order_depths":
+        return {
+            product: _encode({"buy_orders": od.buy_orders, "sell_orders": od.sell_orders})
+            for product, od in value.items()
+        }
+    if field in ("own_trades", "market_trades"):
+        return {
+            product: _encode([trade if isinstance(trade, dict) else _trade_to_dict(trade) for trade in trades])
+            for product, trades in value.items()
+        }
+    return {product: _encode(item) for product, item in value.items()}
+
+
+def _encode_observations(observations):
+    return _encode({
+        "plainValueObservations": observations.plainValueObservations,
+        "conversionObservations": {
+            product: to_serializable(observation) for product, observation in observations.conversionObservations.items()
+        },
+    })
+
+
+class TradingStateWriter:
+    """
+    Écrit une série de TradingState au fil de l'eau dans un fichier NDJSON compact :
+    une ligne d'en-tête, puis une ligne par tick ne contenant que le timestamp et les champs
+    (ou, pour les champs par produit, les produits) qui ont changé depuis le tick précédent.
+    Le fichier se relit avec read_trading_states().
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.count = 0
+        self._previous = {}
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(file_path, "w", encoding="utf-8")
+        self._file.write(_encode({"format": REPORT_FORMAT, "version": REPORT_VERSION}) + "\n")
+
+    def write(self, state):
+        parts = [f'"timestamp":{_encode(state.timestamp)}']
+        for field in PRODUCT_FIELDS:
+            encoded = _encode_product_field(field, getattr(state, field))
+            previous = self._previous.get(field, {})
+            changes = [f"{_encode(product)}:{value}" for product, value in encoded.items() if previous.get(product) != value]
+            changes.extend(f"{_encode(product)}:null" for product in previous if product not in encoded)
+            if changes:
+                parts.append(f'"{field}":{{{",".join(changes)}}}')
+            self._previous[field] = encoded
+        for field in PLAIN_FIELDS:
+            value = getattr(state, field)
+            encoded = _encode_observations(value) if field == "observations" else _encode(value)
+            if self._previous.get(field) != encoded:
+                parts.append(f'"{field}":{encoded}')
+            self._previous[field] = encoded
+        self._file.write("{" + ",".join(parts) + "}\n")
+        self.count += 1
+
+    def write_all(self, trading_states):
+        for state in trading_states:
+            self.write(state)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _build_state(fields):
+    order_depths = {}
+    for product, book in fields["order_depths"].items():
+        od = OrderDepth()
+        od.buy_orders = {int(price): volume for price, volume in book["buy_orders"].items()}
+        od.sell_orders = {int(price): volume for price, volume in book["sell_orders"].items()}
+        order_depths[product] = od
+    observations = fields["observations"]
+    return TradingState(
+        traderData=fields["traderData"],
+        timestamp=fields["timestamp"],
+        listings={product: Listing(**listing) for product, listing in fields["listings"].items()},
+        order_depths=order_depths,
+        own_trades={product: [Trade(**trade) for trade in trades] for product, trades in fields["own_trades"].items()},
+        market_trades={product: [Trade(**trade) for trade in trades] for product, trades in fields["market_trades"].items()},
+        position=dict(fields["position"]),
+        observations=Observation(
+            plainValueObservations=observations["plainValueObservations"],
+            conversionObservations={
+                product: ConversionObservation(**observation)
+                for product, observation in observations["conversionObservations"].items()
+            }
+        )
+    )
+
+
+def read_trading_states(file_path):
+    """
+    Relit un rapport écrit par TradingStateWriter et retourne (générateur) les TradingState
+    reconstitués, tick par tick.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != REPORT_FORMAT or header.get("version") != REPORT_VERSION:
+            raise ValueError(f"Format de rapport non reconnu dans {file_path}: {header}")
+        fields = {field: {} for field in PRODUCT_FIELDS}
+        fields.update({"traderData": "", "observations": {"plainValueObservations": {}, "conversionObservations": {}}})
+        for line in f:
+            record = json.loads(line)
+            fields["timestamp"] = record["timestamp"]
+            for field in PRODUCT_FIELDS:
+                for product, value in record.get(field, {}).items():
+                    if value is None:
+                        fields[field].pop(product, None)
+                    else:
+                        fields[field][product] = value
+            for field in PLAIN_FIELDS:
+                if field in record:
+                    fields[field] = record[field]
+            yield _build_state(fields)
@@ -1,6 +1,7 @@
 # app/controllers/trade_controller.py
 import pandas as pd
 import os
+from controllers.cache_controller import load_cached_csv, load_cached_groups
 
 TRADE_DIR = os.path.join(os.path.dirname(__file__), '../../web_app/data/trades')
 
@@ -12,10 +13,12 @@ def get_trades_filename(day):
     else:
         return f"trades_round_1_day_{day}.csv"
 
-def load_trades_data(product, day):
+def load_trades_data(product, day, use_cache=True):
     filename = get_trades_filename(day)
     filepath = os.path.join(TRADE_DIR, filename)
     try:
+        if use_cache:
+            return load_cached_csv(filepath, 'symbol', product)
         df = pd.read_csv(filepath, sep=';')
         # Filtrer sur le produit souhaité dans la colonne "symbol"
         df_product = df[df['symbol'] == product]
@@ -23,3 +26,22 @@ def load_trades_data(product, day):
     except Exception as e:
         print(f"Erreur lors du chargement du fichier {filepath}: {e}")
         return pd.DataFrame()
+
+def load_trades_data_by_product(products, day, use_cache=True):
+    """
+    Charge le fichier de trades du jour une seule fois et retourne un dict {produit: DataFrame}
+    pour les produits demandés (tous les produits du fichier si products vaut None).
+    """
+    filename = get_trades_filename(day)
+    filepath = os.path.join(TRADE_DIR, filename)
+    try:
+        if use_cache:
+            return load_cached_groups(filepath, 'symbol', products)
+        df = pd.read_csv(filepath, sep=';')
+        frames = {product: df_product for product, df_product in df.groupby('symbol', sort=False)}
+        if products is None:
+            return frames
+        return {product: frames[product] for product in products if product in frames}
+    except Exception as e:
+        print(f"Erreur lors du chargement du fichier {filepath}: {e}")
+        return {}
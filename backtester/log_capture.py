@@ -0,0 +1,90 @@
+# backtester/log_capture.py
+import json
+import os
+
+# Taille maximale (en caractères) des logs conservés par tick, comme la troncature de l'exchange
+LAMBDA_LOG_LIMIT = 3750
+
+# Modes de traitement des print des stratégies pendant une simulation
+LOG_PRINT = "print"      # sortie directe dans le terminal
+LOG_CAPTURE = "capture"  # capture par tick dans lambdaLog / sandboxLog (voir SandboxLogWriter)
+LOG_DISCARD = "discard"  # sortie ignorée (sweeps rapides)
+
+
+class BoundedLogBuffer:
+    """
+    Remplaçant de sys.stdout qui garde au plus `limit` caractères en mémoire ;
+    le reste est compté puis ignoré.
+    """
+
+    def __init__(self, limit: int = LAMBDA_LOG_LIMIT):
+        self.limit = limit
+        self.truncated = 0
+        self._parts = []
+        self._size = 0
+
+    def write(self, text):
+        remaining = self.limit - self._size
+        if remaining >= len(text):
+            self._parts.append(text)
+            self._size += len(text)
+        else:
+            if remaining > 0:
+                self._parts.append(text[:remaining])
+                self._size = self.limit
+            self.truncated += len(text) - max(remaining, 0)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return "".join(self._parts)
+
+
+class NullWriter:
+    """
+    Remplaçant de sys.stdout qui ignore tout ce qu'on lui écrit.
+    """
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class SandboxLogWriter:
+    """
+    Écrit au fil de l'eau les logs capturés de chaque tick, au format des logs de l'exchange
+    (en-tête « Sandbox logs: » puis un objet JSON sandboxLog / lambdaLog / timestamp par tick),
+    lisible par utils/log_reader.py : rien n'est gardé en mémoire d'un tick à l'autre.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.count = 0
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(file_path, "w", encoding="utf-8")
+        self._file.write("Sandbox logs:\n")
+
+    def write(self, timestamp: int, sandbox_log: str, lambda_log: str):
+        block = {
+            "sandboxLog": sandbox_log,
+            "lambdaLog": lambda_log,
+            "timestamp": timestamp,
+        }
+        self._file.write(json.dumps(block, indent=2, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+        print(f"\nSandbox logs saved to '{self.file_path}'.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
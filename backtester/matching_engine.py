@@ -0,0 +1,198 @@
+# backtester/matching_engine.py
+from models.datamodel import Trade
+
+# Limites de position par défaut (celles de la manche 1), utilisées si le trader n'a pas d'attribut LIMIT
+DEFAULT_POSITION_LIMITS = {
+    "RAINFOREST_RESIN": 50,
+    "KELP": 50,
+    "SQUID_INK": 50,
+}
+
+SUBMISSION = "SUBMISSION"
+
+# Modèles d'exécution des ordres restants contre les trades de marché du tick suivant
+PASSIVE_FILL_ALL = "all"      # trades à notre prix ou au-delà
+PASSIVE_FILL_WORSE = "worse"  # trades strictement au-delà de notre prix
+PASSIVE_FILL_NONE = "none"    # aucune exécution passive
+
+
+def get_position_limits(trader):
+    """
+    Retourne les limites de position {produit: limite} du trader (attribut LIMIT, comme dans
+    algorithmic_trading/strategie.py), complétées par DEFAULT_POSITION_LIMITS.
+    """
+    limits = dict(DEFAULT_POSITION_LIMITS)
+    limits.update(getattr(trader, "LIMIT", None) or {})
+    return limits
+
+
+def orders_within_limit(orders, position: int, limit: int) -> bool:
+    """
+    Règle de l'exchange : si tous les ordres d'achat (resp. de vente) d'un produit exécutés
+    en totalité faisaient dépasser la limite de position, tous les ordres du produit sont rejetés.
+    """
+    total_buy = sum(order.quantity for order in orders if order.quantity > 0)
+    total_sell = sum(-order.quantity for order in orders if order.quantity < 0)
+    return position + total_buy <= limit and position - total_sell >= -limit
+
+
+def sorted_levels(order_depth):
+    """
+    Niveaux de prix du carnet sous forme de listes triées de [prix, volume restant] :
+    asks du moins cher au plus cher, bids du plus cher au moins cher (volumes positifs).
+    Ce sont des copies : les exécutions les consomment sans modifier l'OrderDepth.
+    """
+    asks = [[price, -volume] for price, volume in sorted(order_depth.sell_orders.items())]
+    bids = [[price, volume] for price, volume in sorted(order_depth.buy_orders.items(), reverse=True)]
+    return asks, bids
+
+
+def match_against_levels(order, levels, timestamp: int):
+    """
+    Exécute `order` contre les niveaux triés du côté opposé tant que le prix le permet,
+    au prix de chaque niveau et dans la limite du volume disponible.
+    Retourne les trades générés et la quantité restante (signée, comme order.quantity).
+    """
+    trades = []
+    remaining = abs(order.quantity)
+    is_buy = order.quantity > 0
+    for level in levels:
+        if remaining == 0:
+            break
+        price, volume = level
+        if volume <= 0:
+            continue
+        if (is_buy and price > order.price) or (not is_buy and price < order.price):
+            break
+        fill = min(remaining, volume)
+        level[1] -= fill
+        remaining -= fill
+        trades.append(Trade(
+            symbol=order.symbol,
+            price=price,
+            quantity=fill,
+            buyer=SUBMISSION if is_buy else "",
+            seller="" if is_buy else SUBMISSION,
+            timestamp=timestamp
+        ))
+    return trades, remaining if is_buy else -remaining
+
+
+class NextTickTrades:
+    """
+    Trades de marché du tick suivant, contre lesquels nos ordres restants peuvent être exécutés.
+    Par produit, une liste de [prix, volume disponible, acheteur, vendeur, timestamp], construite à
+    la demande seulement (la plupart des ticks n'en ont pas besoin) : soit en lisant la tranche du
+    timestamp dans les tableaux de extract_trade_arrays() grâce à leur index, soit à partir des
+    objets Trade d'un TradingState.
+    """
+
+    def __init__(self, timestamp: int, trade_arrays=None, market_trades=None):
+        self.timestamp = timestamp
+        self.trade_arrays = trade_arrays
+        self.market_trades = market_trades
+        self._cache = {}
+
+    def get(self, product):
+        if product not in self._cache:
+            self._cache[product] = self._load(product)
+        return self._cache[product]
+
+    def _load(self, product):
+        if self.trade_arrays is not None:
+            arrays = self.trade_arrays.get(product)
+            bounds = arrays["index"].get(self.timestamp) if arrays is not None else None
+            if bounds is None:
+                return []
+            start, stop = bounds
+            return [list(row) for row in zip(
+                arrays["price"][start:stop].tolist(),
+                arrays["quantity"][start:stop].tolist(),
+                arrays["buyer"][start:stop],
+                arrays["seller"][start:stop],
+                arrays["timestamp"][start:stop].tolist(),
+            )]
+        return [
+            [trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp]
+            for trade in (self.market_trades or {}).get(product, [])
+        ]
+
+
+def match_against_market_trades(order, remaining: int, market_trades, passive_fill=PASSIVE_FILL_ALL):
+    """
+    Exécute la partie restante d'un ordre (qui reste au carnet jusqu'au tick suivant) contre les
+    trades de marché de ce tick (listes de NextTickTrades), au prix de l'ordre : un achat est servi
+    par les trades à un prix inférieur ou égal au sien (strictement inférieur avec
+    PASSIVE_FILL_WORSE), une vente par les trades à un prix supérieur ou égal.
+    Le volume disponible de chaque trade de marché est consommé.
+    """
+    trades = []
+    is_buy = remaining > 0
+    remaining = abs(remaining)
+    strict = passive_fill == PASSIVE_FILL_WORSE
+    for market_trade in market_trades:
+        if remaining == 0:
+            break
+        price, available, buyer, seller, timestamp = market_trade
+        if available <= 0:
+            continue
+        if is_buy and (price > order.price or (strict and price == order.price)):
+            continue
+        if not is_buy and (price < order.price or (strict and price == order.price)):
+            continue
+        fill = min(remaining, available)
+        market_trade[1] -= fill
+        remaining -= fill
+        trades.append(Trade(
+            symbol=order.symbol,
+            price=order.price,
+            quantity=fill,
+            buyer=SUBMISSION if is_buy else buyer,
+            seller=seller if is_buy else SUBMISSION,
+            timestamp=timestamp
+        ))
+    return trades
+
+
+def execute_orders(state, orders_by_product, limits, next_tick_trades=None, passive_fill=PASSIVE_FILL_ALL):
+    """
+    Exécute les ordres retournés par Trader.run() pour l'état `state` :
+      - les ordres d'un produit qui pourraient dépasser sa limite de position sont tous rejetés ;
+      - chaque ordre est d'abord exécuté contre le carnet (OrderDepth) du tick, niveau par niveau ;
+      - la quantité restante est ensuite confrontée aux trades de marché du tick suivant
+        (`next_tick_trades`, un NextTickTrades) selon le modèle `passive_fill`, puis annulée.
+    Met à jour state.position et retourne les trades exécutés {produit: [Trade]}.
+    """
+    if passive_fill == PASSIVE_FILL_NONE:
+        next_tick_trades = None
+    own_trades = {}
+    for product, orders in orders_by_product.items():
+        if not orders:
+            continue
+        position = state.position.get(product, 0)
+        limit = limits.get(product)
+        if limit is not None and not orders_within_limit(orders, position, limit):
+            print(f"[{state.timestamp}] Ordres {product} rejetés : limite de position {limit} dépassée")
+            continue
+
+        order_depth = state.order_depths.get(product)
+        if order_depth is not None:
+            asks, bids = sorted_levels(order_depth)
+        else:
+            asks, bids = [], []
+
+        trades = []
+        for order in orders:
+            if order.quantity == 0:
+                continue
+            fills, remaining = match_against_levels(order, asks if order.quantity > 0 else bids, state.timestamp)
+            if remaining != 0 and next_tick_trades is not None:
+                fills.extend(match_against_market_trades(order, remaining, next_tick_trades.get(product), passive_fill))
+            for trade in fills:
+                position += trade.quantity if trade.buyer == SUBMISSION else -trade.quantity
+            trades.extend(fills)
+
+        state.position[product] = position
+        if trades:
+            own_trades[product] = trades
+    return own_trades
@@ -11,8 +11,21 @@ UserId = str
 ObservationValue = int
 
 
+def to_serializable(o):
+    """
+    Sérialiseur des objets du datamodel (qui utilisent __slots__ et n'ont donc pas de __dict__) :
+    retourne le dict {attribut: valeur} attendu par json.dumps(default=...).
+    """
+    slots = getattr(type(o), "__slots__", None)
+    if slots is None:
+        return o.__dict__
+    return {name: getattr(o, name) for name in slots}
+
+
 class Listing:
 
+    __slots__ = ("symbol", "product", "denomination")
+
     def __init__(self, symbol: Symbol, product: Product, denomination: Product):
         self.symbol = symbol
         self.product = product
@@ -23,6 +36,8 @@ class Listing:
                  
 class ConversionObservation:
 
+    __slots__ = ("bidPrice", "askPrice", "transportFees", "exportTariff", "importTariff", "sugarPrice", "sunlightIndex")
+
     def __init__(self, bidPrice: float, askPrice: float, transportFees: float, exportTariff: float, importTariff: float, sugarPrice: float, sunlightIndex: float):
         self.bidPrice = bidPrice
         self.askPrice = askPrice
@@ -35,6 +50,8 @@ class ConversionObservation:
 
 class Observation:
 
+    __slots__ = ("plainValueObservations", "conversionObservations")
+
     def __init__(self, plainValueObservations: Dict[Product, ObservationValue], conversionObservations: Dict[Product, ConversionObservation]) -> None:
         self.plainValueObservations = plainValueObservations
         self.conversionObservations = conversionObservations
@@ -45,6 +62,8 @@ class Observation:
 
 class Order:
 
+    __slots__ = ("symbol", "price", "quantity")
+
     def __init__(self, symbol: Symbol, price: int, quantity: int) -> None:
         self.symbol = symbol
         self.price = price
@@ -58,6 +77,8 @@ class Order:
 
 class OrderDepth:
 
+    __slots__ = ("buy_orders", "sell_orders")
+
     def __init__(self):
         self.buy_orders: Dict[int, int] = {}
         self.sell_orders: Dict[int, int] = {}
@@ -65,6 +86,8 @@ class OrderDepth:
 
 class Trade:
 
+    __slots__ = ("symbol", "price", "quantity", "buyer", "seller", "timestamp")
+
     def __init__(self, symbol: Symbol, price: int, quantity: int, buyer: UserId=None, seller: UserId=None, timestamp: int=0) -> None:
         self.symbol = symbol
         self.price: int = price
@@ -81,6 +104,8 @@ class Trade:
 
 class TradingState(object):
 
+    __slots__ = ("traderData", "timestamp", "listings", "order_depths", "own_trades", "market_trades", "position", "observations")
+
     def __init__(self,
                  traderData: str,
                  timestamp: Time,
@@ -100,7 +125,7 @@ class TradingState(object):
         self.observations = observations
         
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True)
+        return json.dumps(self, default=to_serializable, sort_keys=True)
 
     def __str__(self):
         return f"TradingState(timestamp={self.timestamp}, listings={self.listings}, order_depths={self.order_depths}, position={self.position})"
@@ -109,4 +134,4 @@ class TradingState(object):
 class ProsperityEncoder(JSONEncoder):
 
         def default(self, o):
-            return o.__dict__
\ No newline at end of file
+            return to_serializable(o)
\ No newline at end of file
@@ -0,0 +1,142 @@
+# backtester/param_sweep.py
+import copy
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tabulate import tabulate
+
+from batch_runner import STRATEGY_DIR, preload_days, run_backtest_cell, warm_cache
+from strategy_loader import load_trader, preload_strategies
+
+
+def set_param(params, path: str, value):
+    """
+    Affecte `value` à la clé imbriquée `path` de `params`, notée avec des points
+    (ex. "KELP.bollinger_multiplier" pour params["KELP"]["bollinger_multiplier"]).
+    """
+    keys = path.split(".")
+    node = params
+    for key in keys[:-1]:
+        node = node.setdefault(key, {})
+    node[keys[-1]] = value
+
+
+def get_base_params(strategy_path):
+    """
+    Paramètres par défaut d'une stratégie : l'attribut params de son Trader (PARAMS du module
+    pour strategie.py, dict du constructeur pour strategie_2..5).
+    """
+    return copy.deepcopy(load_trader(strategy_path).params)
+
+
+def apply_overrides(base_params, overrides):
+    params = copy.deepcopy(base_params)
+    for path, value in overrides.items():
+        set_param(params, path, value)
+    return params
+
+
+def grid_param_sets(grid):
+    """
+    Produit cartésien d'une grille {chemin: [valeurs]} : retourne la liste des dicts
+    {chemin: valeur} à tester.
+    """
+    paths = list(grid)
+    return [dict(zip(paths, values)) for values in itertools.product(*(grid[path] for path in paths))]
+
+
+def random_param_sets(ranges, n_samples: int, seed=None):
+    """
+    Tirage aléatoire de `n_samples` jeux de paramètres. Chaque entrée de `ranges` est soit une liste
+    de valeurs possibles (tirage uniforme parmi elles), soit un intervalle (min, max) : entier si
+    les deux bornes sont des entiers, réel sinon.
+    """
+    rng = random.Random(seed)
+    param_sets = []
+    for _ in range(n_samples):
+        overrides = {}
+        for path, spec in ranges.items():
+            if isinstance(spec, list):
+                overrides[path] = rng.choice(spec)
+            elif isinstance(spec[0], int) and isinstance(spec[1], int):
+                overrides[path] = rng.randint(spec[0], spec[1])
+            else:
+                overrides[path] = rng.uniform(spec[0], spec[1])
+        param_sets.append(overrides)
+    return param_sets
+
+
+def run_param_set(strategy_path, base_params, overrides, days, products="all"):
+    """
+    Backteste un jeu de paramètres sur tous les jours demandés et agrège les résultats :
+    PnL total et par jour, pire drawdown maximal journalier, nombre de trades et durée.
+    """
+    start = time.perf_counter()
+    params = apply_overrides(base_params, overrides)
+    day_results = [run_backtest_cell(strategy_path, day, products, params) for day in days]
+    return {
+        "overrides": overrides,
+        "pnl": sum(sum(result["pnl"].values()) for result in day_results),
+        "pnl_by_day": {result["day"]: sum(result["pnl"].values()) for result in day_results},
+        "max_drawdown": max(result["max_drawdown"] for result in day_results),
+        "trades": sum(result["trades"] for result in day_results),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def rank_results(results):
+    """
+    Classe les résultats par PnL décroissant, puis par drawdown croissant à PnL égal.
+    """
+    return sorted(results, key=lambda result: (-result["pnl"], result["max_drawdown"]))
+
+
+def _init_worker(strategy_path, days, products):
+    preload_strategies([strategy_path])
+    preload_days(days, products)
+
+
+def run_sweep(strategy_path, param_sets, days, products="all", max_workers=None):
+    """
+    Exécute un backtest par jeu de paramètres (overrides {chemin: valeur} appliqués aux paramètres
+    par défaut de la stratégie) dans un ProcessPoolExecutor. Chaque worker importe la stratégie et
+    précharge les tableaux de marché des jours demandés une seule fois, et les réutilise pour tous
+    ses backtests.
+    Retourne les résultats classés (voir rank_results).
+    """
+    warm_cache(days)
+    base_params = get_base_params(strategy_path)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(strategy_path, days, products)) as executor:
+        futures = [executor.submit(run_param_set, strategy_path, base_params, overrides, days, products) for overrides in param_sets]
+        return rank_results([future.result() for future in futures])
+
+
+def format_sweep(results, top: int = 10):
+    """
+    Met en forme les `top` meilleurs résultats de run_sweep en un tableau.
+    """
+    rows = []
+    for rank, result in enumerate(results[:top], start=1):
+        rows.append([
+            rank,
+            ", ".join(f"{path}={value}" for path, value in result["overrides"].items()),
+            round(result["pnl"], 1),
+            ", ".join(f"{day}: {round(pnl, 1)}" for day, pnl in result["pnl_by_day"].items()),
+            round(result["max_drawdown"], 1),
+            result["trades"],
+            round(result["seconds"], 2),
+        ])
+    headers = ["Rang", "Paramètres", "PnL total", "PnL par jour", "Drawdown max", "Trades", "Durée (s)"]
+    return tabulate(rows, headers=headers)
+
+
+if __name__ == '__main__':
+    strategy = os.path.join(STRATEGY_DIR, "strategie_5.py")
+    grid = {
+        "KELP.bollinger_multiplier": [1.0, 1.5, 2.0],
+        "KELP.rsi_period": [7, 14, 21],
+    }
+    print(format_sweep(run_sweep(strategy, grid_param_sets(grid), days=[-2, -1, 0], products=["KELP"])))
@@ -1,63 +1,96 @@
 # state_builder.py
+import numpy as np
 import pandas as pd
 from models.datamodel import TradingState, OrderDepth, Listing, Observation, Trade
-from controllers.csv_controller import load_market_data
-from controllers.trade_controller import load_trades_data
+from controllers.csv_controller import load_market_data, load_market_data_by_product
+from controllers.trade_controller import load_trades_data, load_trades_data_by_product
+
+BOOK_LEVELS = 3
+
+def _column_as_float(df, column):
+    # Une colonne absente se comporte comme une colonne entièrement vide
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+
+def extract_book_arrays(df):
+    """
+    Convertit en une seule passe les colonnes bid/ask d'un DataFrame de marché (un seul produit)
+    en tableaux NumPy, avec une ligne par timestamp (la première ligne de chaque timestamp,
+    comme group.iloc[0]) triée par timestamp.
+    Pour chaque côté, on obtient des tableaux (n_ticks, BOOK_LEVELS) de prix, de volumes
+    et un masque des niveaux valides (prix et volume renseignés, volume non nul).
+    """
+    df = df.drop_duplicates("timestamp", keep="first").sort_values("timestamp", kind="stable")
+    arrays = {"timestamp": df["timestamp"].to_numpy(dtype=np.int64)}
+    for side in ("bid", "ask"):
+        prices = np.column_stack([_column_as_float(df, f"{side}_price_{i}") for i in range(1, BOOK_LEVELS + 1)])
+        volumes = np.column_stack([_column_as_float(df, f"{side}_volume_{i}") for i in range(1, BOOK_LEVELS + 1)])
+        valid = np.isfinite(prices) & np.isfinite(volumes)
+        # astype(int64) tronque vers zéro, exactement comme int()
+        prices = np.where(valid, prices, 0).astype(np.int64)
+        volumes = np.where(valid, volumes, 0).astype(np.int64)
+        valid &= volumes != 0
+        arrays[f"{side}_prices"] = prices
+        arrays[f"{side}_volumes"] = volumes
+        arrays[f"{side}_valid"] = valid
+    return arrays
+
+def _level_dicts(prices, volumes, valid):
+    """
+    Construit un dict {prix: volume} par ligne, niveau par niveau : pour chaque niveau,
+    seules les lignes valides sont parcourues, à partir de tableaux déjà filtrés par NumPy.
+    """
+    rows = [{} for _ in range(len(prices))]
+    for level in range(prices.shape[1]):
+        mask = valid[:, level]
+        for i, price, volume in zip(np.flatnonzero(mask).tolist(), prices[mask, level].tolist(), volumes[mask, level].tolist()):
+            rows[i][price] = volume
+    return rows
+
+def iter_order_depths(arrays, chunk_size: int = 1000):
+    """
+    Matérialise un OrderDepth par ligne des tableaux produits par extract_book_arrays().
+    Les niveaux sont insérés dans l'ordre 1..BOOK_LEVELS, comme dans la construction d'origine.
+    Les dicts sont construits par blocs de chunk_size lignes pour borner la mémoire.
+    """
+    n = len(arrays["timestamp"])
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        buy_rows = _level_dicts(arrays["bid_prices"][start:stop], arrays["bid_volumes"][start:stop], arrays["bid_valid"][start:stop])
+        sell_rows = _level_dicts(arrays["ask_prices"][start:stop], -arrays["ask_volumes"][start:stop], arrays["ask_valid"][start:stop])
+        for buy_orders, sell_orders in zip(buy_rows, sell_rows):
+            od = OrderDepth()
+            od.buy_orders = buy_orders
+            od.sell_orders = sell_orders
+            yield od
 
 def build_market_snapshots(product: str, day: int):
     """
     Charge les données de marché via load_market_data() pour le produit et la journée donnée,
     puis crée une liste d'objets TradingState, un snapshot par timestamp.
+    Le carnet d'ordres est extrait de façon vectorisée (extract_book_arrays) puis matérialisé
+    en OrderDepth ligne par ligne.
     """
     df = load_market_data(product, day)
     if df.empty:
         print("Aucune donnée de marché trouvée pour ce produit/jour")
         return []
-    
+
+    arrays = extract_book_arrays(df)
     snapshots = []
-    # Groupement par timestamp (les timestamps doivent être numériques ou convertibles en int)
-    grouped = df.groupby("timestamp")
-    
-    for timestamp, group in grouped:
-        # On utilise la première ligne de chaque groupe pour créer le Listing
-        first_row = group.iloc[0]
+    for timestamp, od in zip(arrays["timestamp"].tolist(), iter_order_depths(arrays)):
         listings = {product: Listing(symbol=product, product=product, denomination="SEASHELLS")}
-        
-        # Création d'un OrderDepth à partir des informations du snapshot
-        od = OrderDepth()
-        for i in range(1, 4):
-            bid_price = first_row.get(f"bid_price_{i}")
-            bid_volume = first_row.get(f"bid_volume_{i}")
-            if pd.notna(bid_price) and pd.notna(bid_volume):
-                try:
-                    price = int(bid_price)
-                    volume = int(bid_volume)
-                    if volume != 0:
-                        od.buy_orders[price] = volume
-                except Exception:
-                    continue
-        for i in range(1, 4):
-            ask_price = first_row.get(f"ask_price_{i}")
-            ask_volume = first_row.get(f"ask_volume_{i}")
-            if pd.notna(ask_price) and pd.notna(ask_volume):
-                try:
-                    price = int(ask_price)
-                    volume = int(ask_volume)
-                    if volume != 0:
-                        od.sell_orders[price] = -volume
-                except Exception:
-                    continue
-        
         order_depths = {product: od}
         # Initialisation des positions et des historiques de trades
         positions = {product: 0}
         own_trades = {product: []}
         market_trades = {product: []}
         observations = Observation(plainValueObservations={}, conversionObservations={})
-        
+
         ts = TradingState(
             traderData="",
-            timestamp=int(timestamp),
+            timestamp=timestamp,
             listings=listings,
             order_depths=order_depths,
             own_trades=own_trades,
@@ -66,40 +99,78 @@ def build_market_snapshots(product: str, day: int):
             observations=observations
         )
         snapshots.append(ts)
-    
-    snapshots.sort(key=lambda ts: ts.timestamp)
+
     return snapshots
 
+def extract_trade_arrays(df_trades):
+    """
+    Convertit un DataFrame de trades (un seul symbole) en tableaux NumPy triés par timestamp.
+    Le tri est stable : pour un même timestamp, l'ordre du fichier est conservé.
+    Les lignes dont le timestamp, le prix ou la quantité ne sont pas numériques sont ignorées.
+    Les acheteurs / vendeurs manquants (cellules vides du CSV) sont remplacés par "".
+    Le dict retourné contient aussi un index {timestamp: (début, fin)} vers ces tableaux.
+    """
+    timestamps = pd.to_numeric(df_trades["timestamp"], errors="coerce").to_numpy(dtype=np.float64)
+    prices = pd.to_numeric(df_trades["price"], errors="coerce").to_numpy(dtype=np.float64)
+    quantities = df_trades["quantity"]
+    if not pd.api.types.is_numeric_dtype(quantities.dtype):
+        quantities = quantities.astype(str).str.replace(',', '')
+    quantities = pd.to_numeric(quantities, errors="coerce").to_numpy(dtype=np.float64)
+
+    valid = np.isfinite(timestamps) & np.isfinite(prices) & np.isfinite(quantities)
+    order = np.flatnonzero(valid)
+    order = order[np.argsort(timestamps[order], kind="stable")]
+
+    missing = np.full(len(df_trades), "", dtype=object)
+    arrays = {
+        "timestamp": timestamps[order].astype(np.int64),
+        "price": prices[order].astype(np.int64),
+        "quantity": quantities[order].astype(np.int64),
+        "buyer": (df_trades["buyer"].fillna("").to_numpy(dtype=object) if "buyer" in df_trades.columns else missing)[order],
+        "seller": (df_trades["seller"].fillna("").to_numpy(dtype=object) if "seller" in df_trades.columns else missing)[order],
+    }
+    unique_ts, starts, counts = np.unique(arrays["timestamp"], return_index=True, return_counts=True)
+    arrays["index"] = {ts: (start, start + count) for ts, start, count in zip(unique_ts.tolist(), starts.tolist(), counts.tolist())}
+    return arrays
+
+def trades_from_arrays(trade_arrays, symbol: str, start: int, stop: int):
+    """
+    Matérialise les objets Trade des lignes [start, stop) des tableaux de extract_trade_arrays().
+    """
+    return [
+        Trade(symbol=symbol, price=price, quantity=quantity, buyer=buyer, seller=seller, timestamp=timestamp)
+        for timestamp, price, quantity, buyer, seller in zip(
+            trade_arrays["timestamp"][start:stop].tolist(),
+            trade_arrays["price"][start:stop].tolist(),
+            trade_arrays["quantity"][start:stop].tolist(),
+            trade_arrays["buyer"][start:stop],
+            trade_arrays["seller"][start:stop],
+        )
+    ]
+
 def merge_trade_history_into_snapshots(product: str, day: int, snapshots: list):
     """
     Charge les trades historiques via load_trades_data() pour le produit et la journée donnée,
     et les assigne aux objets TradingState correspondants (en se basant sur le timestamp).
+    Les trades sont indexés par timestamp (extract_trade_arrays) puis rattachés en une seule
+    passe sur les snapshots ; les trades sans snapshot correspondant sont ignorés.
     """
     df_trades = load_trades_data(product, day)
     if df_trades.empty:
         print("Aucune donnée de trades trouvée pour ce produit/jour")
         return
 
-    for idx, row in df_trades.iterrows():
-        try:
-            ts_trade = int(row["timestamp"])
-            price = float(row["price"])
-            quantity = int(str(row["quantity"]).replace(',', ''))
-        except Exception:
+    trade_arrays = extract_trade_arrays(df_trades)
+    trade_index = trade_arrays["index"]
+    for state in snapshots:
+        bounds = trade_index.get(state.timestamp)
+        if bounds is None:
             continue
-        
-        buyer = row.get("buyer", "")
-        seller = row.get("seller", "")
-        trade = Trade(symbol=product, price=int(price), quantity=quantity, buyer=buyer, seller=seller, timestamp=ts_trade)
-        
-        # On cherche le TradingState dont le timestamp correspond exactement au trade
-        for state in snapshots:
-            if state.timestamp == ts_trade:
-                if product in state.market_trades:
-                    state.market_trades[product].append(trade)
-                else:
-                    state.market_trades[product] = [trade]
-                break  # On suppose qu'un trade n'appartient qu'à un seul snapshot
+        trades = trades_from_arrays(trade_arrays, product, *bounds)
+        if product in state.market_trades:
+            state.market_trades[product].extend(trades)
+        else:
+            state.market_trades[product] = trades
 
 def build_complete_trading_states(product: str, day: int):
     """
@@ -108,4 +179,94 @@ def build_complete_trading_states(product: str, day: int):
     """
     snapshots = build_market_snapshots(product, day)
     merge_trade_history_into_snapshots(product, day, snapshots)
-    return snapshots
\ No newline at end of file
+    return snapshots
+
+def load_day_arrays(products, day: int):
+    """
+    Parse une seule fois les fichiers de prix et de trades d'une journée et retourne les tableaux
+    de chaque produit : (books, trades), deux dicts {produit: tableaux} produits respectivement par
+    extract_book_arrays() et extract_trade_arrays(). books est vide si aucune donnée n'est trouvée.
+    `products` est un itérable de produits, ou "all" / None pour tous les produits du fichier.
+    Ces tableaux peuvent être gardés en mémoire et rejoués plusieurs fois avec iter_states_from_arrays().
+    """
+    if products is None or products == "all":
+        products = None
+    else:
+        products = list(products)
+
+    market_frames = load_market_data_by_product(products, day)
+    market_frames = {product: df for product, df in market_frames.items() if not df.empty}
+    if not market_frames:
+        print("Aucune donnée de marché trouvée pour ces produits/jour")
+        return {}, {}
+
+    books = {product: extract_book_arrays(df) for product, df in market_frames.items()}
+    trade_frames = load_trades_data_by_product(list(books), day)
+    trades = {product: extract_trade_arrays(df) for product, df in trade_frames.items() if not df.empty}
+    return books, trades
+
+def iter_states_from_arrays(books, trades, start_timestamp=None):
+    """
+    Générateur des TradingState à partir des tableaux de load_day_arrays(), comme le fait
+    l'exchange : un état par timestamp, contenant l'OrderDepth, le Listing et les trades de
+    marché de chaque produit. Les tableaux ne sont pas modifiés et les états sont neufs à
+    chaque appel : on peut rejouer la même journée autant de fois que nécessaire.
+    Avec `start_timestamp`, seuls les états à partir de ce timestamp sont construits (reprise
+    d'un checkpoint) : les lignes précédentes sont écartées par découpage des tableaux.
+    """
+    if not books:
+        return
+    if start_timestamp is not None:
+        books = {
+            product: {key: values[np.searchsorted(arrays["timestamp"], start_timestamp):] for key, values in arrays.items()}
+            for product, arrays in books.items()
+        }
+        if not any(len(arrays["timestamp"]) for arrays in books.values()):
+            return
+
+    # Chaque produit avance dans ses propres lignes au fil de l'union des timestamps
+    book_timestamps = {product: arrays["timestamp"].tolist() for product, arrays in books.items()}
+    book_iters = {product: iter_order_depths(arrays) for product, arrays in books.items()}
+    book_positions = {product: 0 for product in books}
+    all_timestamps = np.unique(np.concatenate([arrays["timestamp"] for arrays in books.values()])).tolist()
+
+    for timestamp in all_timestamps:
+        order_depths = {}
+        for product, timestamps in book_timestamps.items():
+            i = book_positions[product]
+            if i < len(timestamps) and timestamps[i] == timestamp:
+                order_depths[product] = next(book_iters[product])
+                book_positions[product] = i + 1
+
+        market_trades = {}
+        for product in books:
+            bounds = trades[product]["index"].get(timestamp) if product in trades else None
+            market_trades[product] = trades_from_arrays(trades[product], product, *bounds) if bounds else []
+
+        yield TradingState(
+            traderData="",
+            timestamp=timestamp,
+            listings={product: Listing(symbol=product, product=product, denomination="SEASHELLS") for product in books},
+            order_depths=order_depths,
+            own_trades={product: [] for product in books},
+            market_trades=market_trades,
+            position={product: 0 for product in books},
+            observations=Observation(plainValueObservations={}, conversionObservations={})
+        )
+
+def iter_trading_states(products, day: int):
+    """
+    Générateur de la série de TradingState d'une journée pour plusieurs produits à la fois
+    (voir load_day_arrays et iter_states_from_arrays).
+    Les fichiers de prix et de trades du jour ne sont parsés qu'une seule fois ; les états sont
+    ensuite matérialisés un par un à partir des tableaux, sans jamais garder la série en mémoire.
+    """
+    books, trades = load_day_arrays(products, day)
+    yield from iter_states_from_arrays(books, trades)
+
+def build_multi_product_trading_states(products, day: int):
+    """
+    Version liste de iter_trading_states() : retourne toute la série de TradingState
+    de la journée pour les produits donnés.
+    """
+    return list(iter_trading_states(products, day))
@@ -0,0 +1,76 @@
+# backtester/strategy_loader.py
+import hashlib
+import importlib.util
+import os
+import sys
+
+from models import datamodel
+
+# Modules de stratégie déjà importés : {chemin absolu: (date de modification, module)}
+_MODULE_CACHE = {}
+
+
+def _install_datamodel():
+    """
+    Les stratégies font `from datamodel import ...` comme sur l'exchange : ce nom est résolu vers
+    le modèle du backtester (models.datamodel), pour qu'elles manipulent les mêmes classes que
+    le moteur, sans modifier leur fichier.
+    """
+    if sys.modules.get("datamodel") is not datamodel:
+        sys.modules["datamodel"] = datamodel
+
+
+def _module_name(strategy_path):
+    # Le nom du fichier, sauf s'il est déjà pris par un autre module (le trader doit rester picklable)
+    name = os.path.splitext(os.path.basename(strategy_path))[0]
+    existing = sys.modules.get(name)
+    if existing is None or getattr(existing, "__file__", None) == strategy_path:
+        return name
+    return f"{name}_{hashlib.md5(strategy_path.encode()).hexdigest()[:8]}"
+
+
+def load_strategy_module(strategy_path):
+    """
+    Importe le fichier de stratégie `strategy_path` (ex. algorithmic_trading/strategie_5.py) et
+    le garde en cache dans le processus : les appels suivants retournent le même module sans le
+    recompiler, tant que le fichier n'a pas été modifié.
+    Le dossier du fichier est ajouté au sys.path pour ses autres imports (ex. state_codec) et le
+    module est enregistré dans sys.modules, pour que ses objets puissent être picklés (voir checkpoint).
+    """
+    strategy_path = os.path.abspath(strategy_path)
+    mtime = os.path.getmtime(strategy_path)
+    cached = _MODULE_CACHE.get(strategy_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    _install_datamodel()
+    strategy_dir = os.path.dirname(strategy_path)
+    if strategy_dir not in sys.path:
+        sys.path.insert(0, strategy_dir)
+    module_name = _module_name(strategy_path)
+    spec = importlib.util.spec_from_file_location(module_name, strategy_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    _MODULE_CACHE[strategy_path] = (mtime, module)
+    return module
+
+
+def load_trader(strategy_path, params=None):
+    """
+    Retourne une nouvelle instance de la classe Trader du fichier de stratégie `strategy_path`,
+    construite avec `params` s'ils sont donnés. Le module n'est importé qu'une fois par processus
+    (voir load_strategy_module) : seules les instances sont neuves, les variables globales du
+    module (ex. PARAMS de strategie.py) sont partagées entre elles.
+    """
+    module = load_strategy_module(strategy_path)
+    return module.Trader(params) if params is not None else module.Trader()
+
+
+def preload_strategies(strategy_paths):
+    """
+    Importe les stratégies demandées dans le processus courant (utilisé dans l'initializer des
+    workers), pour que leurs backtests n'instancient plus que des Trader.
+    """
+    for strategy_path in strategy_paths:
+        load_strategy_module(strategy_path)
@@ -0,0 +1,117 @@
+# backtester/tournament.py
+import itertools
+import os
+import time
+
+from tabulate import tabulate
+
+from state_builder import iter_states_from_arrays, load_day_arrays
+from backtester import TIME_BUDGET, simulate_trading_states, timing_summary
+from accounting import accounting_summary, compute_accounting
+from trade_ledger import TradeLedger
+from strategy_loader import load_trader
+from log_capture import LOG_DISCARD, LOG_PRINT
+from batch_runner import STRATEGY_DIR
+from models.datamodel import TradingState
+
+
+def isolated_state(state):
+    """
+    Copie d'un TradingState historique propre à un trader : listes de trades de marché, positions
+    et own_trades sont de nouveaux objets, pour que le moteur ne modifie pas l'état vu par les
+    autres traders. Les carnets, que simulate_trading_states copie déjà pour chaque appel à
+    Trader.run (voir backtester._trader_view), ainsi que les Listing, Trade et Observation,
+    jamais modifiés, sont partagés.
+    """
+    return TradingState(
+        traderData=state.traderData,
+        timestamp=state.timestamp,
+        listings=state.listings,
+        order_depths=state.order_depths,
+        own_trades={product: list(trades) for product, trades in state.own_trades.items()},
+        market_trades={product: list(trades) for product, trades in state.market_trades.items()},
+        position=dict(state.position),
+        observations=state.observations
+    )
+
+
+def run_tournament(strategy_paths, day: int, products="all", quiet=True, time_budget=TIME_BUDGET):
+    """
+    Fait jouer plusieurs stratégies sur la même journée, en parallèle tick par tick :
+    les tableaux de marché sont chargés et chaque TradingState historique est construit une
+    seule fois, puis chaque trader en reçoit une copie isolée (voir isolated_state) et avance
+    d'un tick avant que l'état suivant ne soit construit.
+    Retourne un résultat par stratégie : PnL par produit, drawdown maximal, ratio de type Sharpe,
+    nombre de trades, durées de Trader.run (voir timing_summary) et taille du traderData.
+    """
+    books, trades = load_day_arrays(products, day)
+    if not books:
+        print("Aucun état historique chargé.")
+        return []
+
+    names = [os.path.splitext(os.path.basename(path))[0] for path in strategy_paths]
+    # Un seul flux d'états historiques, dupliqué pour chaque trader
+    streams = itertools.tee(iter_states_from_arrays(books, trades), len(strategy_paths))
+    log_mode = LOG_DISCARD if quiet else LOG_PRINT
+    players = []
+    for path, stream in zip(strategy_paths, streams):
+        ledger = TradeLedger()
+        simulation_log = []
+        simulation = simulate_trading_states(map(isolated_state, stream), load_trader(path), simulation_log, ledger,
+                                             time_budget=time_budget, log_mode=log_mode, trade_arrays=trades)
+        players.append({"ledger": ledger, "simulation_log": simulation_log, "simulation": simulation})
+
+    start = time.perf_counter()
+    for _ in zip(*(player["simulation"] for player in players)):
+        pass
+    seconds = time.perf_counter() - start
+
+    results = []
+    for name, player in zip(names, players):
+        summary = accounting_summary(compute_accounting(player["ledger"], books))
+        # Taille du traderData retourné par chaque appel à Trader.run
+        trader_data = [entry["trader_data_size"] for entry in player["simulation_log"] if "trader_data_size" in entry]
+        results.append({
+            "strategy": name,
+            "pnl": {product: values["pnl"] for product, values in summary["products"].items()},
+            "total_pnl": summary["pnl"],
+            "max_drawdown": summary["max_drawdown"],
+            "sharpe": summary["sharpe"],
+            "trades": len(player["ledger"]),
+            "ticks": len(player["simulation_log"]),
+            "timings": timing_summary(player["simulation_log"]),
+            "trader_data_mean": sum(trader_data) / len(trader_data) if trader_data else 0.0,
+            "trader_data_max": max(trader_data, default=0),
+        })
+    print(f"\nTournoi du jour {day} : {len(results)} stratégies en {seconds:.2f} s.")
+    return sorted(results, key=lambda result: -result["total_pnl"])
+
+
+def format_leaderboard(results):
+    """
+    Met en forme les résultats de run_tournament en un classement (une ligne par stratégie).
+    """
+    rows = []
+    for rank, result in enumerate(results, start=1):
+        rows.append([
+            rank,
+            result["strategy"],
+            round(result["total_pnl"], 1),
+            ", ".join(f"{product}: {round(pnl, 1)}" for product, pnl in result["pnl"].items()),
+            round(result["max_drawdown"], 1),
+            round(result["sharpe"], 2),
+            result["trades"],
+            *(round(result["timings"][key], 2) for key in ("mean", "p50", "p99", "max")),
+            result["timings"]["over_budget"],
+            round(result["trader_data_mean"]),
+            result["trader_data_max"],
+        ])
+    headers = ["Rang", "Stratégie", "PnL total", "PnL par produit", "Drawdown max", "Sharpe", "Trades",
+               "run moy. (ms)", "run p50 (ms)", "run p99 (ms)", "run max (ms)", "Hors budget", "traderData moy.", "traderData max"]
+    return tabulate(rows, headers=headers)
+
+
+if __name__ == '__main__':
+    strategies = [os.path.join(STRATEGY_DIR, name) for name in ("strategie.py", "strategie_2.py", "strategie_3.py", "strategie_4.py", "strategie_5.py")]
+    day = 0
+    print(format_leaderboard(run_tournament(strategies, day)))
@@ -0,0 +1,44 @@
+# backtester/trade_ledger.py
+
+
+class TradeLedger:
+    """
+    Journal de tous nos trades exécutés pendant un backtest, en ajout seul.
+    Les trades d'un tick occupent la tranche [offsets[i], offsets[i + 1]) de `trades`,
+    i étant l'indice du tick dans `timestamps` : rien n'est recopié d'un tick à l'autre.
+    """
+
+    def __init__(self):
+        self.trades = []
+        self.timestamps = []
+        self.offsets = [0]
+
+    def __len__(self):
+        return len(self.trades)
+
+    def record(self, timestamp: int, fills):
+        """
+        Ajoute les trades exécutés au tick `timestamp` ({produit: [Trade]}) et retourne
+        les bornes (début, fin) de ces trades dans le journal.
+        """
+        start = len(self.trades)
+        for trades in fills.values():
+            self.trades.extend(trades)
+        self.timestamps.append(timestamp)
+        self.offsets.append(len(self.trades))
+        return start, len(self.trades)
+
+    def tick_trades(self, tick: int):
+        """
+        Retourne les trades du tick d'indice `tick`, regroupés par produit.
+        """
+        own_trades = {}
+        for trade in self.trades[self.offsets[tick]:self.offsets[tick + 1]]:
+            own_trades.setdefault(trade.symbol, []).append(trade)
+        return own_trades
+
+    def product_trades(self, product: str):
+        """
+        Retourne tous les trades du journal pour un produit, dans l'ordre chronologique.
+        """
+        return [trade for trade in self.trades if trade.symbol == product]
@@ -0,0 +1,12 @@
+# tests/conftest.py
+import os
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKTESTER_DIR = os.path.join(ROOT_DIR, "backtester")
+STRATEGY_DIR = os.path.join(ROOT_DIR, "algorithmic_trading")
+
+# Les modules du backtester et des stratégies s'importent par leur nom, comme quand ils sont lancés en script
+for directory in (STRATEGY_DIR, BACKTESTER_DIR):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
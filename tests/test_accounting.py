@@ -0,0 +1,81 @@
+# tests/test_accounting.py
+import numpy as np
+import pytest
+
+from accounting import _realized_by_trade, compute_accounting, ledger_arrays
+from matching_engine import SUBMISSION
+from models.datamodel import Trade
+from trade_ledger import TradeLedger
+
+
+def _realized_reference(prices, quantities):
+    # Coût moyen, trade par trade
+    realized = []
+    position, average_price = 0, 0.0
+    for price, quantity in zip(prices, quantities):
+        if position == 0 or (position > 0) == (quantity > 0):
+            average_price = (average_price * position + price * quantity) / (position + quantity)
+            position += quantity
+            realized.append(0.0)
+            continue
+        closed = min(abs(quantity), abs(position))
+        realized.append(closed * (price - average_price) * (1 if position > 0 else -1))
+        new_position = position + quantity
+        if new_position == 0:
+            average_price = 0.0
+        elif (new_position > 0) != (position > 0):
+            average_price = price
+        position = new_position
+    return np.array(realized)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_realized_matches_trade_by_trade_average_cost(seed):
+    rng = np.random.default_rng(seed)
+    quantities = rng.integers(1, 20, 300) * rng.choice([-1, 1], 300)
+    prices = rng.integers(1990, 2010, 300).astype(np.float64)
+    np.testing.assert_allclose(_realized_by_trade(prices, quantities), _realized_reference(prices, quantities), atol=1e-9)
+
+
+def test_realized_on_flip_and_flat():
+    prices = np.array([100.0, 110.0, 105.0, 90.0, 95.0])
+    quantities = np.array([10, -4, -10, 4, 5])
+    # Long 10 à 100 ; vend 4 (+40) ; vend 10 : ferme 6 (+30), short 4 à 105 ; rachète 4 (+60) ; long 5
+    np.testing.assert_allclose(_realized_by_trade(prices, quantities), [0, 40, 30, 60, 0])
+
+
+def _trade(symbol, price, quantity, buy):
+    buyer, seller = (SUBMISSION, "") if buy else ("", SUBMISSION)
+    return Trade(symbol, price, quantity, buyer, seller, 0)
+
+
+def _books(product, timestamps, mid):
+    n = len(timestamps)
+    valid = np.zeros((n, 3), dtype=bool)
+    valid[:, 0] = True
+    prices = np.zeros((n, 3), dtype=np.int64)
+    return {product: {
+        "timestamp": np.asarray(timestamps, dtype=np.int64),
+        "bid_prices": prices + mid - 1, "bid_volumes": prices + 5, "bid_valid": valid,
+        "ask_prices": prices + mid + 1, "ask_volumes": prices - 5, "ask_valid": valid,
+    }}
+
+
+def test_ledger_arrays_and_accounting():
+    ledger = TradeLedger()
+    ledger.record(0, {"KELP": [_trade("KELP", 99, 3, True)], "SQUID_INK": [_trade("SQUID_INK", 50, 2, False)]})
+    ledger.record(100, {})
+    ledger.record(200, {"KELP": [_trade("KELP", 103, 1, False)]})
+
+    arrays = ledger_arrays(ledger)
+    assert arrays["timestamp"].tolist() == [0, 0, 200]
+    assert arrays["products"] == ["KELP", "SQUID_INK"]
+    assert arrays["product"].tolist() == [0, 1, 0]
+    assert arrays["quantity"].tolist() == [3, -2, -1]
+
+    accounting = compute_accounting(ledger, _books("KELP", [0, 100, 200], 100))
+    kelp = accounting["products"]["KELP"]
+    assert kelp["position"].tolist() == [3, 3, 2]
+    assert kelp["realized"].tolist() == [0.0, 0.0, 4.0]
+    # Cash -297 puis +103, inventaire au mid 100
+    assert kelp["pnl"].tolist() == [3.0, 3.0, 6.0]
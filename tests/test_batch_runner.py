@@ -0,0 +1,16 @@
+# tests/test_batch_runner.py
+import os
+
+from batch_runner import run_backtest_cell
+from conftest import STRATEGY_DIR
+
+STRATEGY = os.path.join(STRATEGY_DIR, "strategie.py")
+
+
+def test_time_budget_is_passed_through():
+    summary = run_backtest_cell(STRATEGY, 0, ["KELP"], time_budget=None)
+    assert summary["timings"]["over_budget"] == 0
+    # Budget nul : le premier appel le dépasse et interrompt la simulation
+    summary = run_backtest_cell(STRATEGY, 0, ["KELP"], time_budget=0.0, abort_on_timeout=True)
+    assert summary["ticks"] == 2
+    assert summary["timings"]["calls"] == summary["timings"]["over_budget"] == 1
@@ -0,0 +1,40 @@
+# tests/test_book_view.py
+from book_view import BookView
+from models.datamodel import OrderDepth
+
+
+def _order_depth():
+    order_depth = OrderDepth()
+    order_depth.buy_orders = {2027: 5, 2029: 3, 2028: 10}
+    order_depth.sell_orders = {2033: -6, 2031: -4}
+    return order_depth
+
+
+def test_derived_values():
+    book = BookView(_order_depth())
+    assert book.bids == [(2029, 3), (2028, 10), (2027, 5)]
+    assert book.asks == [(2031, 4), (2033, 6)]
+    assert (book.best_bid, book.best_ask, book.mid_price) == (2029, 2031, 2030.0)
+    assert book.cumulative_bid_volume == [3, 13, 18]
+    assert book.imbalance == (18 - 10) / 28
+    assert book.bid_volume_at_or_above(2028) == 13 and book.ask_volume_at_or_below(2032) == 4
+    assert book.best_bid_below(2029) == 2028 and book.best_ask_above(2033) is None
+
+
+def test_consume_updates_order_depth_and_cache():
+    order_depth = _order_depth()
+    book = BookView(order_depth)
+    assert book.best_ask == 2031
+    book.consume_ask(2031, 4)
+    assert 2031 not in order_depth.sell_orders
+    assert book.best_ask == 2033 and book.total_ask_volume == 6
+    book.consume_bid(2029, 1)
+    assert order_depth.buy_orders[2029] == 2 and book.best_bid_volume == 2
+
+
+def test_empty_side():
+    order_depth = OrderDepth()
+    order_depth.buy_orders = {2029: 3}
+    book = BookView(order_depth)
+    assert book.mid_price is None and book.best_ask is None and book.best_ask_volume == 0
+    assert book.imbalance == 1.0
@@ -0,0 +1,40 @@
+# tests/test_cache_controller.py
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT_DIR
+from controllers.cache_controller import load_cached_csv, load_cached_groups
+
+PRICES_FILE = os.path.join(ROOT_DIR, "web_app", "data", "csv", "prices_round_1_day_0.csv")
+TRADES_FILE = os.path.join(ROOT_DIR, "web_app", "data", "trades", "trades_round_1_day_0.csv")
+
+
+def _read_csv_filtered(filepath, group_column, group):
+    df = pd.read_csv(filepath, sep=';')
+    return df[df[group_column] == group]
+
+
+@pytest.mark.parametrize("filepath, group_column", [(PRICES_FILE, "product"), (TRADES_FILE, "symbol")])
+@pytest.mark.parametrize("group", ["KELP", "UNKNOWN_PRODUCT"])
+def test_cached_frames_match_csv(tmp_path, filepath, group_column, group):
+    expected = _read_csv_filtered(filepath, group_column, group)
+    # Premier appel : construction du cache ; second appel : lecture des fichiers NPZ
+    for _ in range(2):
+        frame = load_cached_csv(filepath, group_column, group, cache_dir=str(tmp_path))
+        pd.testing.assert_frame_equal(frame, expected)
+    assert os.listdir(tmp_path)
+
+
+def test_cache_is_rebuilt_when_source_changes(tmp_path):
+    source = tmp_path / "prices.csv"
+    source.write_text("day;timestamp;product;mid_price\n0;0;KELP;2030.5\n0;100;RESIN;10000.0\n")
+    cache_dir = str(tmp_path / "cache")
+    assert load_cached_groups(str(source), "product", cache_dir=cache_dir)["KELP"]["mid_price"].tolist() == [2030.5]
+
+    source.write_text("day;timestamp;product;mid_price\n0;0;KELP;2031.0\n0;100;KELP;2032.0\n")
+    os.utime(source, ns=(1, 1))
+    frames = load_cached_groups(str(source), "product", cache_dir=cache_dir)
+    assert list(frames) == ["KELP"]
+    assert frames["KELP"]["mid_price"].tolist() == [2031.0, 2032.0]
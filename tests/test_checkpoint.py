@@ -0,0 +1,33 @@
+# tests/test_checkpoint.py
+import json
+import os
+import subprocess
+import sys
+
+from conftest import BACKTESTER_DIR, STRATEGY_DIR
+
+STRATEGY_PATH = os.path.join(STRATEGY_DIR, "strategie_5.py")
+
+
+def _run_backtest_subprocess(cwd, arguments):
+    # Nouveau processus : la stratégie n'y a jamais été importée avant la relecture du checkpoint
+    script = (
+        "import json, sys\n"
+        f"sys.path.insert(0, {BACKTESTER_DIR!r})\n"
+        "from backtester import run_backtest\n"
+        f"summary = run_backtest(**{arguments!r})\n"
+        "print('SUMMARY ' + json.dumps(summary))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True, text=True, check=True)
+    line = next(line for line in completed.stdout.splitlines() if line.startswith("SUMMARY "))
+    return json.loads(line[len("SUMMARY "):])
+
+
+def test_resume_in_new_process_matches_full_run(tmp_path):
+    full = _run_backtest_subprocess(tmp_path, {"products": "KELP", "day": 0, "strategy_path": STRATEGY_PATH,
+                                               "checkpoint_every": 5000})
+    checkpoint_path = os.path.join("backtester", "reports", "checkpoint.pkl")
+    assert os.path.exists(tmp_path / checkpoint_path)
+
+    resumed = _run_backtest_subprocess(tmp_path, {"products": "KELP", "day": 0, "resume_from": checkpoint_path})
+    assert resumed == full
@@ -0,0 +1,66 @@
+# tests/test_indicators.py
+import numpy as np
+import pytest
+
+from indicators import RSI_SIMPLE, RSI_WILDER, new_rsi, new_slope, rsi_update, rsi_value, slope_update, slope_value
+from state_codec import decode_trader_data, encode_trader_data
+
+
+def _prices(seed, n=400):
+    # Mid prices au demi-point, comme dans les carnets
+    rng = np.random.default_rng(seed)
+    return (2000 + np.cumsum(rng.integers(-4, 5, n)) / 2).tolist()
+
+
+def _through_trader_data(state):
+    # L'état est relu depuis le traderData à chaque tick, comme dans Trader.run
+    return decode_trader_data(encode_trader_data({"state": state}))["state"]
+
+
+def _rsi(avg_gain, avg_loss):
+    return 100 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def _batch_simple_rsi(prices, period):
+    changes = np.diff(prices[-(period + 1):])
+    return _rsi(changes[changes > 0].sum() / period, -changes[changes < 0].sum() / period)
+
+
+def _batch_wilder_rsi(prices, period):
+    changes = np.diff(prices)
+    gains, losses = np.maximum(changes, 0), np.maximum(-changes, 0)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    return _rsi(avg_gain, avg_loss)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("mode, batch", [(RSI_SIMPLE, _batch_simple_rsi), (RSI_WILDER, _batch_wilder_rsi)])
+def test_incremental_rsi_matches_batch(seed, mode, batch):
+    period = 14
+    prices = _prices(seed)
+    rsi = new_rsi(period, mode)
+    for t, price in enumerate(prices):
+        rsi = _through_trader_data(rsi)
+        rsi_update(rsi, price)
+        if t < period:
+            assert rsi_value(rsi) is None
+        else:
+            assert rsi_value(rsi) == pytest.approx(batch(prices[:t + 1], period), abs=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("window", [2, 5, 50])
+def test_incremental_slope_matches_least_squares(seed, window):
+    prices = _prices(seed)
+    slope = new_slope(window)
+    for t, price in enumerate(prices):
+        slope = _through_trader_data(slope)
+        slope_update(slope, price)
+        if t + 1 < window:
+            assert slope_value(slope) is None
+        else:
+            expected = np.polyfit(np.arange(window), prices[t + 1 - window:t + 1], 1)[0]
+            assert slope_value(slope) == pytest.approx(expected, abs=1e-9)
@@ -0,0 +1,52 @@
+# tests/test_log_capture.py
+import itertools
+import json
+
+from backtester import simulate_trading_states
+from log_capture import LOG_CAPTURE, SandboxLogWriter
+from state_builder import iter_states_from_arrays, load_day_arrays
+from trade_ledger import TradeLedger
+
+
+class PrintingTrader:
+    def run(self, state):
+        print(f"tick {state.timestamp}")
+        return {}, 0, ""
+
+
+def _read_blocks(file_path):
+    with open(file_path, encoding="utf-8") as f:
+        content = f.read()
+    assert content.startswith("Sandbox logs:\n")
+    decoder = json.JSONDecoder()
+    body = content[len("Sandbox logs:\n"):]
+    blocks, position = [], 0
+    while position < len(body):
+        block, position = decoder.raw_decode(body, position)
+        blocks.append(block)
+        # Un bloc JSON par tick, suivi d'un saut de ligne
+        position += 1
+    return blocks
+
+
+def test_captured_logs_are_streamed_per_tick(tmp_path):
+    books, trades = load_day_arrays(["KELP"], 0)
+    states = itertools.islice(iter_states_from_arrays(books, trades), 6)
+    simulation_log = []
+    file_path = tmp_path / "sandbox_logs.log"
+    with SandboxLogWriter(str(file_path)) as writer:
+        simulation = simulate_trading_states(states, PrintingTrader(), simulation_log, TradeLedger(),
+                                             log_mode=LOG_CAPTURE, trade_arrays=trades, log_writer=writer)
+        next(simulation)
+        next(simulation)
+        # Les logs des ticks déjà joués sont écrits, pas gardés dans le log de simulation
+        assert writer.count == 2
+        assert all("lambdaLog" not in entry for entry in simulation_log)
+        # Ni ordres ni positions : quelques valeurs par tick seulement
+        assert set(simulation_log[-1]) == {"timestamp", "run_time", "over_budget", "trader_data_size"}
+        simulated = list(simulation)
+
+    blocks = _read_blocks(file_path)
+    assert len(simulated) == 4
+    assert [block["timestamp"] for block in blocks] == [entry["timestamp"] for entry in simulation_log[1:]]
+    assert blocks[0]["lambdaLog"] == f"tick {blocks[0]['timestamp']}\n"
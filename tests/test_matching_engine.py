@@ -0,0 +1,98 @@
+# tests/test_matching_engine.py
+from backtester import simulate_trading_states
+from log_capture import LOG_DISCARD
+from matching_engine import (PASSIVE_FILL_ALL, PASSIVE_FILL_NONE, PASSIVE_FILL_WORSE, SUBMISSION, NextTickTrades,
+                             execute_orders)
+from models.datamodel import Observation, Order, OrderDepth, Trade, TradingState
+from state_builder import load_day_arrays, trades_from_arrays
+from trade_ledger import TradeLedger
+
+LIMITS = {"KELP": 50}
+
+
+def _state(position=0, buy_orders=None, sell_orders=None):
+    order_depth = OrderDepth()
+    order_depth.buy_orders = dict(buy_orders or {2028: 10, 2027: 5})
+    order_depth.sell_orders = dict(sell_orders or {2031: -4, 2032: -6})
+    return TradingState("", 100, {}, {"KELP": order_depth}, {}, {}, {"KELP": position}, Observation({}, {}))
+
+
+def _fills(trades):
+    return [(trade.price, trade.quantity, trade.buyer, trade.seller) for trade in trades]
+
+
+def test_orders_exceeding_position_limit_are_all_rejected():
+    state = _state(position=45)
+    # 45 + 4 + 2 > 50 : tous les ordres KELP sont rejetés, même le premier
+    fills = execute_orders(state, {"KELP": [Order("KELP", 2031, 4), Order("KELP", 2032, 2)]}, LIMITS)
+    assert fills == {}
+    assert state.position["KELP"] == 45
+
+
+def test_sell_side_limit_is_checked_separately():
+    state = _state(position=-48)
+    fills = execute_orders(state, {"KELP": [Order("KELP", 2028, -3)]}, LIMITS)
+    assert fills == {}
+    fills = execute_orders(state, {"KELP": [Order("KELP", 2031, 7)]}, LIMITS)
+    # Seul le niveau à 2031 est au prix de l'ordre ; le reste est annulé
+    assert _fills(fills["KELP"]) == [(2031, 4, SUBMISSION, "")]
+    assert state.position["KELP"] == -44
+
+
+def test_order_walks_the_book_without_modifying_it():
+    state = _state()
+    fills = execute_orders(state, {"KELP": [Order("KELP", 2032, 7), Order("KELP", 2027, -12)]}, LIMITS)
+    assert _fills(fills["KELP"]) == [(2031, 4, SUBMISSION, ""), (2032, 3, SUBMISSION, ""),
+                                     (2028, 10, "", SUBMISSION), (2027, 2, "", SUBMISSION)]
+    assert state.position["KELP"] == -5
+    assert state.order_depths["KELP"].sell_orders == {2031: -4, 2032: -6}
+
+
+def _next_tick(*market_trades):
+    return NextTickTrades(200, market_trades={"KELP": [Trade("KELP", price, quantity, "A", "B", 200)
+                                                       for price, quantity in market_trades]})
+
+
+def test_remaining_quantity_fills_against_next_tick_trades():
+    order = {"KELP": [Order("KELP", 2029, 6)]}
+    fills = execute_orders(_state(), order, LIMITS, _next_tick((2030, 5), (2029, 2), (2028, 3)), PASSIVE_FILL_ALL)
+    # Exécution au prix de l'ordre, contre les trades à 2029 ou moins
+    assert _fills(fills["KELP"]) == [(2029, 2, SUBMISSION, "B"), (2029, 3, SUBMISSION, "B")]
+
+    fills = execute_orders(_state(), order, LIMITS, _next_tick((2029, 2), (2028, 3)), PASSIVE_FILL_WORSE)
+    assert _fills(fills["KELP"]) == [(2029, 3, SUBMISSION, "B")]
+
+    fills = execute_orders(_state(), order, LIMITS, _next_tick((2028, 3)), PASSIVE_FILL_NONE)
+    assert fills == {}
+
+
+def test_next_tick_trades_from_arrays_match_trade_objects():
+    _, trades = load_day_arrays(["KELP"], 0)
+    arrays = trades["KELP"]
+    timestamp = next(ts for ts, (start, stop) in arrays["index"].items() if stop - start > 1)
+    start, stop = arrays["index"][timestamp]
+    market_trades = {"KELP": trades_from_arrays(arrays, "KELP", start, stop)}
+    from_arrays = NextTickTrades(timestamp, trade_arrays=trades).get("KELP")
+    assert from_arrays == NextTickTrades(timestamp, market_trades=market_trades).get("KELP")
+    assert len(from_arrays) == stop - start
+    assert NextTickTrades(timestamp + 1, trade_arrays=trades).get("KELP") == []
+
+
+class BookConsumingTrader:
+    # Comme strategie.py : retire de son carnet les niveaux qu'il prend
+    def run(self, state):
+        order_depth = state.order_depths["KELP"]
+        price, volume = min(order_depth.sell_orders.items())
+        del order_depth.sell_orders[price]
+        return {"KELP": [Order("KELP", price, -volume)]}, 0, ""
+
+
+def test_orders_match_against_book_before_trader_mutation():
+    states = [_state(), _state()]
+    states[1].timestamp = 200
+    ledger = TradeLedger()
+    simulated = list(simulate_trading_states(states, BookConsumingTrader(), [], ledger, log_mode=LOG_DISCARD))
+    assert _fills(ledger.trades) == [(2031, 4, SUBMISSION, "")]
+    assert simulated[0].position["KELP"] == 4
+    # Le carnet historique n'est pas modifié par la stratégie
+    assert simulated[0].order_depths["KELP"].sell_orders == {2031: -4, 2032: -6}
@@ -0,0 +1,42 @@
+# tests/test_report_controller.py
+import itertools
+
+from backtester import save_trading_states, simulate_trading_states
+from controllers.report_controller import read_trading_states
+from log_capture import LOG_DISCARD
+from sample_trader import SimpleTrader
+from state_builder import iter_states_from_arrays, load_day_arrays
+from trade_ledger import TradeLedger
+
+
+def _plain(value):
+    # Objets du datamodel (avec __slots__) convertis en dicts, pour comparer des états complets
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if hasattr(value, "__slots__"):
+        return {name: _plain(getattr(value, name)) for name in value.__slots__}
+    if hasattr(value, "__dict__"):
+        return {name: _plain(item) for name, item in vars(value).items()}
+    return value
+
+
+def test_write_then_read_trading_states_is_identity(tmp_path):
+    books, trades = load_day_arrays("all", 0)
+    states = itertools.islice(iter_states_from_arrays(books, trades), 300)
+    simulated = list(simulate_trading_states(states, SimpleTrader(), [], TradeLedger(), log_mode=LOG_DISCARD,
+                                             trade_arrays=trades))
+    # Quelques états où la position, les own_trades et le traderData changent
+    simulated[10].traderData = '{"KELP":{"history":"@f2b:203050:AA=="}}'
+    assert any(state.own_trades for state in simulated)
+    own_trades = [trade for state in simulated for trades in state.own_trades.values() for trade in trades]
+    assert all(isinstance(trade.buyer, str) and isinstance(trade.seller, str) for trade in own_trades)
+
+    file_path = str(tmp_path / "states.ndjson")
+    save_trading_states(simulated, file_path)
+    restored = list(read_trading_states(file_path))
+    assert [_plain(state) for state in restored] == [_plain(state) for state in simulated]
+    # Contreparties manquantes écrites comme "" : pas de NaN (JSON invalide) dans le rapport
+    with open(file_path) as file:
+        assert "NaN" not in file.read()
@@ -0,0 +1,54 @@
+# tests/test_ring_buffer.py
+import pytest
+
+from ring_buffer import RingBuffer, load_ring_buffer
+from state_codec import decode_trader_data, encode_trader_data
+
+
+def test_append_evicts_oldest_value():
+    history = RingBuffer(capacity=3)
+    assert [history.append(value) for value in (1.5, 2.0, 2.5, 3.0, 3.5)] == [None, None, None, 1.5, 2.0]
+    assert history.to_list() == [2.5, 3.0, 3.5]
+    assert history[0] == 2.5 and history[-1] == 3.5 and history[-2:] == [3.0, 3.5]
+    with pytest.raises(IndexError):
+        history[3]
+
+
+def test_round_trip_through_trader_data():
+    history = RingBuffer([2030.5, 2031.0], capacity=4)
+    for value in (2029.5, 2030.0, 2032.5):
+        history.append(value)
+    decoded = decode_trader_data(encode_trader_data({"KELP": {"history": history}}))
+    restored = load_ring_buffer(decoded["KELP"]["history"], 4)
+    assert restored.to_list() == history.to_list() == [2031.0, 2029.5, 2030.0, 2032.5]
+    restored.append(2033.0)
+    assert restored.to_list() == [2029.5, 2030.0, 2032.5, 2033.0]
+
+
+def test_load_ring_buffer_reuses_live_buffer():
+    history = RingBuffer([1.0, 2.0], capacity=5)
+    assert load_ring_buffer(history, 5) is history
+    assert load_ring_buffer(history, 1).to_list() == [2.0]
+
+
+def test_legacy_list_and_capacity_change():
+    assert RingBuffer([1.0, 2.0, 3.0, 4.0], capacity=2).to_list() == [3.0, 4.0]
+    history = RingBuffer(capacity=3)
+    for value in range(5):
+        history.append(value)
+    assert RingBuffer(history.to_data(), capacity=2).to_list() == [3.0, 4.0]
+
+
+def test_large_values_switch_to_64_bits():
+    history = RingBuffer([1.0], capacity=3)
+    history.append(1e12)
+    assert history.values.typecode == "q"
+    assert history.to_list() == [1.0, 1e12]
+    restored = RingBuffer(decode_trader_data(encode_trader_data(history)), capacity=3)
+    assert restored.values.typecode == "q" and restored.to_list() == [1.0, 1e12]
+
+
+def test_values_packed_as_small_deltas():
+    history = RingBuffer([2030.0, 2030.5, 2030.0, 2031.0], capacity=4)
+    assert encode_trader_data(history) == '{"h":0,"v":"@ib:203000:Ms5k"}'
+
@@ -0,0 +1,31 @@
+# tests/test_rolling_stats.py
+import numpy as np
+import pytest
+
+from rolling_stats import new_stats, stats_mean, stats_pop, stats_push, stats_std
+from state_codec import decode_trader_data, encode_trader_data
+
+
+def _prices(seed, n=400):
+    # Mid prices au demi-point, comme dans les carnets
+    rng = np.random.default_rng(seed)
+    return (2000 + np.cumsum(rng.integers(-4, 5, n)) / 2).tolist()
+
+
+def _through_trader_data(state):
+    # L'état est relu depuis le traderData à chaque tick, comme dans Trader.run
+    return decode_trader_data(encode_trader_data({"state": state}))["state"]
+
+
+@pytest.mark.parametrize("window", [1, 2, 30])
+def test_rolling_stats_match_batch(window):
+    prices = _prices(7)
+    stats = new_stats(prices[:window])
+    for t in range(window, len(prices)):
+        stats = _through_trader_data(stats)
+        stats_push(stats, prices[t])
+        stats_pop(stats, prices[t - window])
+        values = prices[t + 1 - window:t + 1]
+        assert stats_mean(stats) == pytest.approx(np.mean(values), abs=1e-9)
+        expected_std = np.std(values, ddof=1) if window > 1 else 0.0
+        assert stats_std(stats) == pytest.approx(expected_std, abs=1e-9)
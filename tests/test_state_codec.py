@@ -0,0 +1,47 @@
+# tests/test_state_codec.py
+import math
+
+import pytest
+
+from state_codec import PACKED_PREFIX, decode_trader_data, encode_trader_data
+
+
+def _round_trip(data):
+    return decode_trader_data(encode_trader_data(data))
+
+
+@pytest.mark.parametrize("values", [
+    [2030.5, 2031.0, 2029.5, 2030.0],
+    [10000, 10001, 9999, 10000],
+    [0.1, 0.2, 0.3],
+    [0.0012, -0.0034, 1.0],
+    [2030.125, 2030.5],
+    [1e20, 1.0],
+    [1 << 70, 1],
+    [1e308, -1e308],
+    [-5],
+])
+def test_number_lists_round_trip_exactly(values):
+    assert _round_trip({"KELP": {"history": values}}) == {"KELP": {"history": values}}
+
+
+def test_half_point_history_is_packed():
+    encoded = encode_trader_data({"history": [2030.5, 2031.0, 2029.5]})
+    assert f'"{PACKED_PREFIX}f' in encoded
+
+
+def test_non_finite_values_round_trip():
+    decoded = _round_trip({"values": [math.nan, 1.0, math.inf]})["values"]
+    assert math.isnan(decoded[0]) and decoded[1:] == [1.0, math.inf]
+
+
+@pytest.mark.parametrize("text", ["@f2b:1:AA==", "@", "@@", "plain"])
+def test_user_strings_round_trip(text):
+    data = {"note": text, "notes": [text, "other"]}
+    assert _round_trip(data) == data
+
+
+def test_empty_and_mixed_structures_round_trip():
+    data = {"empty": [], "nested": [[1, 2], {"a": [0.5]}], "flags": [True, False], "none": None}
+    assert _round_trip(data) == data
+    assert decode_trader_data("") == {}
@@ -0,0 +1,51 @@
+# tests/test_strategy_loader.py
+import os
+import pickle
+
+from models import datamodel
+from strategy_loader import load_strategy_module, load_trader
+
+STRATEGY = '''
+from datamodel import Order
+
+VERSION = {version}
+
+
+class Trader:
+    def __init__(self, params=None):
+        self.params = params
+
+    def run(self, state):
+        return {{"KELP": [Order("KELP", 2030, VERSION)]}}, 0, ""
+'''
+
+
+def _write_strategy(path, version, mtime):
+    path.write_text(STRATEGY.format(version=version))
+    os.utime(path, (mtime, mtime))
+
+
+def test_module_is_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "loader_strategy.py"
+    _write_strategy(path, 1, 1_000_000)
+    module = load_strategy_module(str(path))
+    assert load_strategy_module(str(path)) is module
+    # `from datamodel import ...` est résolu vers le modèle du backtester
+    assert module.Order is datamodel.Order
+
+    _write_strategy(path, 2, 1_000_010)
+    reloaded = load_strategy_module(str(path))
+    assert reloaded is not module
+    assert reloaded.VERSION == 2
+    assert load_strategy_module(str(path)) is reloaded
+
+
+def test_load_trader_returns_new_picklable_instances(tmp_path):
+    path = tmp_path / "loader_trader.py"
+    _write_strategy(path, 3, 1_000_000)
+    first = load_trader(str(path), {"KELP": {"window": 5}})
+    second = load_trader(str(path))
+    assert first is not second and type(first) is type(second)
+    assert first.params == {"KELP": {"window": 5}} and second.params is None
+    orders, _, _ = pickle.loads(pickle.dumps(first)).run(None)
+    assert orders["KELP"][0].quantity == 3
@@ -0,0 +1,22 @@
+# tests/test_tournament.py
+from tournament import run_tournament
+
+GROWING_TRADER = '''
+class Trader:
+    def __init__(self):
+        self.calls = 0
+
+    def run(self, state):
+        self.calls += 1
+        return {}, 0, "x" * self.calls
+'''
+
+
+def test_trader_data_size_is_measured_on_returned_value(tmp_path):
+    strategy_path = tmp_path / "growing_trader.py"
+    strategy_path.write_text(GROWING_TRADER)
+    [result] = run_tournament([str(strategy_path)], 0, products=["KELP"])
+    calls = result["timings"]["calls"]
+    # Le traderData du dernier appel (calls caractères) est compté
+    assert result["trader_data_max"] == calls
+    assert result["trader_data_mean"] == (calls + 1) / 2
@@ -0,0 +1,18 @@
+# tests/test_trade_ledger.py
+from models.datamodel import Trade
+from trade_ledger import TradeLedger
+
+
+def test_ticks_are_slices_of_the_ledger():
+    ledger = TradeLedger()
+    kelp = Trade("KELP", 2030, 2, "SUBMISSION", "", 0)
+    resin = Trade("RAINFOREST_RESIN", 10001, 1, "", "SUBMISSION", 0)
+    assert ledger.record(0, {"KELP": [kelp], "RAINFOREST_RESIN": [resin]}) == (0, 2)
+    assert ledger.record(100, {}) == (2, 2)
+    later = Trade("KELP", 2031, 3, "", "SUBMISSION", 200)
+    assert ledger.record(200, {"KELP": [later]}) == (2, 3)
+
+    assert len(ledger) == 3
+    assert ledger.tick_trades(0) == {"KELP": [kelp], "RAINFOREST_RESIN": [resin]}
+    assert ledger.tick_trades(1) == {}
+    assert ledger.product_trades("KELP") == [kelp, later]
@@ -0,0 +1,33 @@
+# app/controllers/cache_controller.py
+import importlib.util
+import os
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '../../data/cache')
+
+# Implémentation partagée avec le backtester, chargée par son chemin
+# (les deux projets ont chacun un package `controllers`)
+_SHARED_PATH = os.path.join(os.path.dirname(__file__), '../../../backtester/controllers/cache_controller.py')
+_spec = importlib.util.spec_from_file_location("backtester_cache_controller", _SHARED_PATH)
+_shared = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_shared)
+
+
+def load_cached_groups(filepath, group_column, groups=None):
+    """
+    Voir backtester/controllers/cache_controller.py, avec le dossier de cache de l'application.
+    """
+    return _shared.load_cached_groups(filepath, group_column, groups, cache_dir=CACHE_DIR)
+
+
+def load_cached_csv(filepath, group_column, group):
+    """
+    Voir backtester/controllers/cache_controller.py, avec le dossier de cache de l'application.
+    """
+    return _shared.load_cached_csv(filepath, group_column, group, cache_dir=CACHE_DIR)
+
+
+def clear_cache():
+    """
+    Supprime tous les fichiers de cache de l'application.
+    """
+    _shared.clear_cache(CACHE_DIR)
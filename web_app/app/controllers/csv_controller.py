@@ -1,6 +1,7 @@
 # app/controllers/csv_controller.py
 import pandas as pd
 import os
+from controllers.cache_controller import load_cached_csv
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '../../data/csv')
 
@@ -12,10 +13,12 @@ def get_market_filename(day):
     else:
         return f"prices_round_1_day_{day}.csv"
 
-def load_market_data(product, day):
+def load_market_data(product, day, use_cache=True):
     filename = get_market_filename(day)
     filepath = os.path.join(DATA_DIR, filename)
     try:
+        if use_cache:
+            return load_cached_csv(filepath, 'product', product)
         df = pd.read_csv(filepath, sep=';')
         # Filtrer sur le produit souhaité
         df_product = df[df['product'] == product]
@@ -1,6 +1,7 @@
 # app/controllers/trade_controller.py
 import pandas as pd
 import os
+from controllers.cache_controller import load_cached_csv
 
 TRADE_DIR = os.path.join(os.path.dirname(__file__), '../../data/trades')
 
@@ -12,10 +13,12 @@ def get_trades_filename(day):
     else:
         return f"trades_round_1_day_{day}.csv"
 
-def load_trades_data(product, day):
+def load_trades_data(product, day, use_cache=True):
     filename = get_trades_filename(day)
     filepath = os.path.join(TRADE_DIR, filename)
     try:
+        if use_cache:
+            return load_cached_csv(filepath, 'symbol', product)
         df = pd.read_csv(filepath, sep=';')
         # Filtrer sur le produit souhaité dans la colonne "symbol"
         df_product = df[df['symbol'] == product]